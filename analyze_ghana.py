@@ -1,10 +1,40 @@
 #!/usr/bin/env python3
 """Analyze the Ghana player statistics data."""
 
+import os
+
+import numpy as np
 import pandas as pd
 
-# Load the data
-df = pd.read_csv('data/statistics/ghana_player_statistics.csv')
+STATS_CSV = 'data/statistics/ghana_player_statistics.csv'
+# Columnar cache of STATS_CSV, rebuilt whenever the CSV is rewritten
+STATS_PARQUET = STATS_CSV.replace('.csv', '.parquet')
+
+# Numeric columns the report reads, parsed with explicit narrow dtypes so
+# pandas can skip type inference on them. Every other column is still loaded
+# because the overview and sample record cover the full schema.
+NUMERIC_DTYPES = {
+    'player_id': 'int32',
+    'season': 'int16',
+    'appearances': 'float32',
+    'minutes': 'float32',
+    'goals': 'float32',
+    'assists': 'float32',
+    'rating': 'float64',  # printed as-is, keep full precision
+    'passes_total': 'float32',
+    'passes_accuracy': 'float32',
+    'tackles_total': 'float32',
+    'duels_total': 'float32',
+    'duels_won': 'float32',
+    'shots_total': 'float32',
+    'shots_on_target': 'float32',
+}
+
+# Load the data (parse the CSV only when the Parquet cache is missing or stale)
+if (not os.path.exists(STATS_PARQUET)
+        or os.path.getmtime(STATS_PARQUET) < os.path.getmtime(STATS_CSV)):
+    pd.read_csv(STATS_CSV, dtype=NUMERIC_DTYPES).to_parquet(STATS_PARQUET, index=False)
+df = pd.read_parquet(STATS_PARQUET)
 
 print("="*70)
 print("GHANA PLAYER STATISTICS - DATA QUALITY REPORT")
@@ -14,7 +44,7 @@ print(f"\n📊 OVERVIEW:")
 print(f"   Total records: {len(df)}")
 print(f"   Total columns: {len(df.columns)}")
 print(f"   Unique players: {df['player_id'].nunique()}")
-print(f"   Seasons covered: {sorted(df['season'].unique())}")
+print(f"   Seasons covered: {sorted(df['season'].unique().tolist())}")
 
 # Count records with meaningful data
 has_appearances = df['appearances'] > 0
@@ -28,20 +58,35 @@ print(f"   Records with rating: {has_rating.sum()}")
 
 # Show players with best stats
 print(f"\n⭐ TOP PLAYERS BY APPEARANCES:")
-top_players = df[df['appearances'] > 5].sort_values('appearances', ascending=False).head(10)
-for _, row in top_players.iterrows():
-    print(f"   {row['player_name']:20} | {row['season']} | {row['team_name']:25} | Apps: {row['appearances']:.0f} | Goals: {row['goals']:.0f} | Rating: {row['rating'] if pd.notna(row['rating']) else 'N/A'}")
+# Partial selection on the raw array: np.partition finds the 10th-largest
+# appearance count in O(N), then only the rows above it (plus the earliest
+# rows tied with it, like nlargest) are sorted
+appearances = df['appearances'].to_numpy()
+candidates = np.flatnonzero(appearances > 5)
+top_n = min(10, candidates.size)
+top_idx = candidates[:0]
+if top_n:
+    cutoff = np.partition(appearances[candidates], -top_n)[-top_n]
+    above = candidates[appearances[candidates] > cutoff]
+    tied = candidates[appearances[candidates] == cutoff][:top_n - above.size]
+    top_idx = np.concatenate([above, tied])
+    top_idx = top_idx[np.lexsort((top_idx, -appearances[top_idx]))]
+top_players = df.iloc[top_idx][['player_name', 'season', 'team_name', 'appearances', 'goals', 'rating']]
+for player_name, season, team_name, apps, goals, rating in top_players.itertuples(index=False, name=None):
+    print(f"   {player_name:20} | {season} | {team_name:25} | Apps: {apps:.0f} | Goals: {goals:.0f} | Rating: {rating if pd.notna(rating) else 'N/A'}")
 
 # Show column completeness
 print(f"\n📋 COLUMN COMPLETENESS:")
 key_columns = ['appearances', 'minutes', 'goals', 'assists', 'rating', 
                'passes_total', 'passes_accuracy', 'tackles_total', 
                'duels_total', 'duels_won', 'shots_total', 'shots_on_target']
+key_columns = [col for col in key_columns if col in df.columns]
+key_stats = df[key_columns]
+non_null = key_stats.notna().sum()
+non_zero = key_stats.gt(0).sum()
 for col in key_columns:
-    non_null = df[col].notna().sum()
-    non_zero = (df[col] > 0).sum() if col in df.columns else 0
-    pct = (non_null / len(df)) * 100
-    print(f"   {col:25} | {non_null:4}/{len(df)} ({pct:5.1f}%) | Non-zero: {non_zero}")
+    pct = (non_null[col] / len(df)) * 100
+    print(f"   {col:25} | {non_null[col]:4}/{len(df)} ({pct:5.1f}%) | Non-zero: {non_zero[col]}")
 
 # Sample of complete data
 print(f"\n🎯 SAMPLE COMPLETE RECORD:")
@@ -2,19 +2,146 @@
 API Client for API-Football.
 Handles all HTTP requests with rate limiting, API key rotation, and error handling.
 """
+import os
+import sys
+import gzip
+import json
 import time
+import random
+import hashlib
+import atexit
+import logging
+import itertools
 import threading
-import requests
-from typing import Optional, Dict, Any, List
+import logging.handlers
+from queue import SimpleQueue
 from collections import deque
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
 import backoff
 
 from config import (
     API_FOOTBALL_KEYS,
     API_FOOTBALL_BASE_URL,
     REQUESTS_PER_KEY_PER_MINUTE,
+    API_CACHE_DIR,
+    API_CACHE_TTL_SECONDS,
+    API_LOG_LEVEL,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _configure_logging() -> None:
+    """
+    Send this module's log records through a queue to a background thread
+    that writes them to stderr, so worker threads never block on console I/O.
+    """
+    if logger.handlers:
+        return
+    
+    log_queue = SimpleQueue()
+    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stderr_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(API_LOG_LEVEL)
+    logger.propagate = False
+
+
+_configure_logging()
+
+# Response header carrying the key's remaining daily requests
+DAILY_REMAINING_HEADER = "x-ratelimit-requests-remaining"
+
+# Fallback cooldowns when a rate-limit response carries no Retry-After header
+RATE_LIMIT_COOLDOWN_SECONDS = 60
+HTTP_429_COOLDOWN_SECONDS = 10
+MAX_RATE_LIMIT_RETRIES = 5
+
+
+class RateLimitExhausted(requests.exceptions.RequestException):
+    """Raised when a request is still rate limited after MAX_RATE_LIMIT_RETRIES."""
+
+# The sliding window is kept slightly longer than the API's minute so that
+# clock skew and request latency don't let a full burst land inside one
+# server-side minute
+RATE_WINDOW_SECONDS = 60
+RATE_WINDOW_MARGIN_SECONDS = 1.5
+
+# Adaptive pacing: each rate-limit response multiplies that key's request
+# rate by RATE_DECREASE_FACTOR (never below MIN_RATE_PER_MINUTE); every
+# successful response adds RATE_RECOVERY_FRACTION of the configured rate
+# back until the key is at full speed again
+RATE_DECREASE_FACTOR = 0.7
+RATE_RECOVERY_FRACTION = 0.05
+MIN_RATE_PER_MINUTE = 1.0
+RATE_LIMIT_HISTORY = 100
+
+# Default concurrency for APIFootballClient.batch; the HTTP connection pool
+# is sized to match so concurrent requests reuse keep-alive connections
+BATCH_WORKERS_PER_KEY = 2
+
+# Batches the scrapers run at the same time (one per team being scraped or
+# repaired in parallel); the pool keeps enough idle connections for all of them
+CONCURRENT_BATCHES = 4
+
+
+class ResponseCache:
+    """
+    On-disk cache of successful API responses.
+    Entries are gzipped JSON files keyed by endpoint + query params (never the
+    API key), and expire after ttl_seconds.
+    """
+    
+    def __init__(self, cache_dir: str, ttl_seconds: int):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.enabled = ttl_seconds > 0
+        self.hits = 0
+
+    def _path(self, endpoint: str, params: Optional[Dict[str, Any]]) -> str:
+        """Build the cache file path for a request."""
+        request_id = f"{endpoint}?{json.dumps(params or {}, sort_keys=True)}"
+        digest = hashlib.sha1(request_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, endpoint.replace("/", "_"), f"{digest}.json.gz")
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Return the cached response, or None if missing, expired or unreadable."""
+        if not self.enabled:
+            return None
+        
+        path = self._path(endpoint, params)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                return None
+            with gzip.open(path, "rb") as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        
+        self.hits += 1
+        return data
+
+    def set(self, endpoint: str, params: Optional[Dict[str, Any]], body: bytes) -> None:
+        """
+        Store a response body as received, so it is never re-serialized
+        (written to a temp file first so readers never see partial data).
+        """
+        if not self.enabled:
+            return
+        
+        path = self._path(endpoint, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
 
 class RateLimitedKeyManager:
     """
@@ -28,55 +155,93 @@ class RateLimitedKeyManager:
             raise ValueError("At least one API key is required")
         
         self.api_keys = api_keys
+        self.num_keys = len(api_keys)
         self.requests_per_minute = requests_per_minute
-        self.window_seconds = 60
+        self.window_seconds = RATE_WINDOW_SECONDS + RATE_WINDOW_MARGIN_SECONDS
         
-        # Track request timestamps for each key
-        # key_index -> deque of timestamps
-        self.request_timestamps: Dict[int, deque] = {
-            i: deque() for i in range(len(api_keys))
-        }
+        # Track request timestamps for each key in a fixed-size ring buffer.
+        # slots[key_index][slot_idx[key_index]] is the oldest of the last
+        # `requests_per_minute` requests, i.e. the slot the next request reuses.
+        self.slots: List[List[float]] = [
+            [0.0] * requests_per_minute for _ in range(len(api_keys))
+        ]
+        self.slot_idx: List[int] = [0] * len(api_keys)
+        
+        # Keys the API told us to back off from are skipped until this time
+        self.cooldown_until: List[float] = [0.0] * len(api_keys)
+        
+        # Current adaptive rate of each key (requests/min). Below the
+        # configured rate, requests on that key are spaced evenly instead of
+        # bursting through the window, until successes bring it back up.
+        self.rate_ceiling = float(requests_per_minute)
+        self.key_rates: List[float] = [self.rate_ceiling] * len(api_keys)
+        self.paced_until: List[float] = [0.0] * len(api_keys)
+        self.rate_limit_times: deque = deque(maxlen=RATE_LIMIT_HISTORY)
+        self.rate_limited_count = 0
         
         # Track disabled keys (suspended, invalid, etc.)
         self.disabled_keys: set = set()
         
-        self.current_key_index = 0
+        # Daily requests left on each key, as reported by the last response
+        # made with it (None until one is seen)
+        self.daily_remaining: List[Optional[int]] = [None] * len(api_keys)
+        
+        # Each key's ring buffer is guarded by its own lock so threads picking
+        # different keys don't serialize; the rotator hands every caller a
+        # different starting key (next() on itertools.count is atomic)
+        self.key_locks = [threading.Lock() for _ in api_keys]
+        self._rotator = itertools.count()
+        
+        # Guards disabled_keys and the wait/notify path only
         self.lock = threading.Lock()
+        # Waiters for a free key sleep on this condition (releasing the lock)
+        # and are woken early when the set of usable keys changes
+        self.key_available = threading.Condition(self.lock)
         
-        print(f"Initialized API client with {len(api_keys)} key(s), "
-              f"{requests_per_minute} requests/min per key "
-              f"(total: {len(api_keys) * requests_per_minute}/min)")
+        logger.info(
+            "Initialized API client with %d key(s), %d requests/min per key (total: %d/min)",
+            len(api_keys), requests_per_minute, len(api_keys) * requests_per_minute,
+        )
 
-    def _clean_old_timestamps(self, key_index: int) -> None:
-        """Remove timestamps older than the rate limit window."""
-        current_time = time.time()
-        cutoff = current_time - self.window_seconds
-        
-        timestamps = self.request_timestamps[key_index]
-        while timestamps and timestamps[0] < cutoff:
-            timestamps.popleft()
+    def _key_ready_time(self, key_index: int) -> float:
+        """Time at which a key can next be used (oldest slot expiry, cooldown or pacing end)."""
+        oldest = self.slots[key_index][self.slot_idx[key_index]]
+        return max(
+            oldest + self.window_seconds,
+            self.cooldown_until[key_index],
+            self.paced_until[key_index],
+        )
+
+    def _is_key_free(self, key_index: int, now: float) -> bool:
+        """Check whether a key is out of cooldown and has a free slot in the window."""
+        return now >= self._key_ready_time(key_index)
+
+    def _record_request(self, key_index: int, now: float) -> None:
+        """Overwrite the oldest slot of a key with the current request time."""
+        idx = self.slot_idx[key_index]
+        self.slots[key_index][idx] = now
+        self.slot_idx[key_index] = (idx + 1) % self.requests_per_minute
+        rate = self.key_rates[key_index]
+        if rate < self.rate_ceiling:
+            self.paced_until[key_index] = now + self.window_seconds / rate
 
     def _get_available_key(self) -> Optional[int]:
         """
-        Find an available key that hasn't exceeded its rate limit and is not disabled.
+        Find and claim a key that hasn't exceeded its rate limit and is not disabled.
+        The request is recorded on the claimed key before its lock is released.
         Returns key index or None if all keys are exhausted.
         """
-        checked = 0
-        while checked < len(self.api_keys):
-            # Skip disabled keys
-            if self.current_key_index in self.disabled_keys:
-                self.current_key_index = (self.current_key_index + 1) % len(self.api_keys)
-                checked += 1
+        num_keys = self.num_keys
+        start = next(self._rotator) % num_keys
+        now = time.time()
+        for offset in range(num_keys):
+            key_index = (start + offset) % num_keys
+            if key_index in self.disabled_keys:
                 continue
-                
-            self._clean_old_timestamps(self.current_key_index)
-            
-            if len(self.request_timestamps[self.current_key_index]) < self.requests_per_minute:
-                return self.current_key_index
-            
-            # Try next key
-            self.current_key_index = (self.current_key_index + 1) % len(self.api_keys)
-            checked += 1
+            with self.key_locks[key_index]:
+                if self._is_key_free(key_index, now):
+                    self._record_request(key_index, now)
+                    return key_index
         
         return None
 
@@ -85,36 +250,72 @@ class RateLimitedKeyManager:
         with self.lock:
             self.disabled_keys.add(key_index)
             key_preview = f"{self.api_keys[key_index][:8]}..."
-            print(f"  ⛔ Disabled API key #{key_index + 1} ({key_preview}): {reason}")
+            logger.warning("  ⛔ Disabled API key #%d (%s): %s", key_index + 1, key_preview, reason)
+            
+            # Wake waiters so they re-pick keys (or fail fast if none are left)
+            self.key_available.notify_all()
             
-            active_keys = len(self.api_keys) - len(self.disabled_keys)
+            active_keys = self.num_keys - len(self.disabled_keys)
             if active_keys == 0:
-                print("  ⚠️ WARNING: All API keys are disabled!")
+                logger.warning("  ⚠️ WARNING: All API keys are disabled!")
             else:
-                print(f"  📊 Remaining active keys: {active_keys}")
+                logger.info("  📊 Remaining active keys: %d", active_keys)
+
+    def cool_key(self, key_index: int, seconds: float):
+        """
+        Stop using a key for the given number of seconds (e.g. after HTTP 429)
+        and slow its request rate down.
+        """
+        now = time.time()
+        with self.key_locks[key_index]:
+            self.cooldown_until[key_index] = max(
+                self.cooldown_until[key_index], now + seconds
+            )
+            self.key_rates[key_index] = max(
+                MIN_RATE_PER_MINUTE, self.key_rates[key_index] * RATE_DECREASE_FACTOR
+            )
+        with self.lock:
+            self.rate_limited_count += 1
+            self.rate_limit_times.append(now)
+            # Waiters may have computed a wake-up time that is now too early
+            self.key_available.notify_all()
+
+    def record_success(self, key_index: int):
+        """Let a slowed-down key speed back up after a successful request."""
+        if self.key_rates[key_index] >= self.rate_ceiling:
+            return
+        with self.key_locks[key_index]:
+            self.key_rates[key_index] = min(
+                self.rate_ceiling,
+                self.key_rates[key_index] + self.rate_ceiling * RATE_RECOVERY_FRACTION,
+            )
+            if self.key_rates[key_index] >= self.rate_ceiling:
+                self.paced_until[key_index] = 0.0
+
+    def get_rate_stats(self) -> Dict[str, Any]:
+        """Get the adaptive rate of each key and recent rate-limit responses."""
+        cutoff = time.time() - self.window_seconds
+        rate_limit_times = list(self.rate_limit_times)
+        return {
+            "key_rates_per_minute": [round(rate, 2) for rate in self.key_rates],
+            "rate_limited_total": self.rate_limited_count,
+            "rate_limited_last_minute": sum(t > cutoff for t in rate_limit_times),
+            "last_rate_limited_at": rate_limit_times[-1] if rate_limit_times else None,
+        }
 
-    def _get_wait_time(self) -> float:
+    def _get_wait_time(self, now: float) -> float:
         """Calculate how long to wait until a key becomes available."""
-        min_wait = float('inf')
-        current_time = time.time()
-        
-        for key_index in range(len(self.api_keys)):
-            # Skip disabled keys
-            if key_index in self.disabled_keys:
-                continue
-                
-            self._clean_old_timestamps(key_index)
-            timestamps = self.request_timestamps[key_index]
-            
-            if len(timestamps) < self.requests_per_minute:
-                return 0
-            
-            # Time until oldest request expires
-            oldest = timestamps[0]
-            wait_time = (oldest + self.window_seconds) - current_time
-            min_wait = min(min_wait, wait_time)
+        ready_times = [
+            self._key_ready_time(i)
+            for i in range(self.num_keys)
+            if i not in self.disabled_keys
+        ]
+        if not ready_times:
+            return 0
         
-        return max(0, min_wait) if min_wait != float('inf') else 0
+        # Time until the first key frees up
+        wait_time = min(ready_times) - now
+        return max(0, wait_time)
 
     def get_key_with_rate_limit(self) -> tuple:
         """
@@ -124,40 +325,41 @@ class RateLimitedKeyManager:
         Returns:
             tuple: (api_key, key_index) for the available key
         """
-        with self.lock:
-            # Check if all keys are disabled
-            if len(self.disabled_keys) >= len(self.api_keys):
+        while True:
+            # Check if all keys are disabled (re-checked after every wait)
+            if len(self.disabled_keys) >= self.num_keys:
                 raise RuntimeError("All API keys are disabled. Cannot make requests.")
             
-            while True:
-                key_index = self._get_available_key()
-                
-                if key_index is not None:
-                    # Record this request
-                    self.request_timestamps[key_index].append(time.time())
-                    # Move to next key for fair distribution
-                    self.current_key_index = (key_index + 1) % len(self.api_keys)
-                    return (self.api_keys[key_index], key_index)
-                
-                # All keys exhausted, need to wait
-                wait_time = self._get_wait_time()
+            # Fast path: only the claimed key's lock is taken
+            key_index = self._get_available_key()
+            if key_index is not None:
+                return (self.api_keys[key_index], key_index)
+            
+            # All keys exhausted, need to wait
+            with self.lock:
+                wait_time = self._get_wait_time(time.time())
                 if wait_time > 0:
-                    print(f"  ⏳ Rate limit reached on all keys, waiting {wait_time:.1f}s...")
-                    time.sleep(wait_time + 0.1)  # Small buffer
+                    logger.debug("  ⏳ Rate limit reached on all keys, waiting %.1fs...", wait_time)
+                    self.key_available.wait(timeout=wait_time + 0.1)  # Small buffer
 
     def get_status(self) -> Dict[str, Any]:
         """Get current status of all API keys."""
-        with self.lock:
-            status = {}
-            for i, key in enumerate(self.api_keys):
-                self._clean_old_timestamps(i)
-                remaining = self.requests_per_minute - len(self.request_timestamps[i])
-                status[f"key_{i+1}"] = {
-                    "key_preview": f"{key[:8]}...{key[-4:]}",
-                    "requests_used": len(self.request_timestamps[i]),
-                    "requests_remaining": remaining,
-                }
-            return status
+        # One cutoff for all keys; a slot counts as used while it is
+        # still inside the window
+        cutoff = time.time() - self.window_seconds
+        used_per_key = []
+        for key_lock, key_slots in zip(self.key_locks, self.slots):
+            with key_lock:
+                used_per_key.append(sum(t > cutoff for t in key_slots))
+        
+        status = {}
+        for i, (key, used) in enumerate(zip(self.api_keys, used_per_key)):
+            status[f"key_{i+1}"] = {
+                "key_preview": f"{key[:8]}...{key[-4:]}",
+                "requests_used": used,
+                "requests_remaining": self.requests_per_minute - used,
+            }
+        return status
 
 
 class APIFootballClient:
@@ -170,7 +372,18 @@ class APIFootballClient:
             REQUESTS_PER_KEY_PER_MINUTE
         )
         self.session = requests.Session()
+        # requests keeps at most 10 idle connections per host by default;
+        # with more batch workers than that, extra connections are dropped
+        # after each request and later ones pay a new TCP + TLS handshake
+        pool_size = max(10, len(API_FOOTBALL_KEYS) * BATCH_WORKERS_PER_KEY * CONCURRENT_BATCHES)
+        self.session.mount(
+            "https://",
+            requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size),
+        )
+        self.cache = ResponseCache(API_CACHE_DIR, API_CACHE_TTL_SECONDS)
+        # Incremented from the batch worker threads
         self.total_requests = 0
+        self._total_requests_lock = threading.Lock()
 
     @backoff.on_exception(
         backoff.expo,
@@ -191,63 +404,166 @@ class APIFootballClient:
         Returns:
             JSON response as dictionary
         """
-        url = f"{self.base_url}/{endpoint}"
-        
-        # Get an available API key (will wait if rate limited)
-        api_key, key_index = self.key_manager.get_key_with_rate_limit()
+        # Serve repeated requests from disk without spending quota
+        cached = self.cache.get(endpoint, params)
+        if cached is not None:
+            return cached
         
-        headers = {"x-apisports-key": api_key}
+        url = f"{self.base_url}/{endpoint}"
+        rate_limit_retries = 0
         
-        try:
-            response = self.session.get(url, params=params, headers=headers, timeout=30)
-            self.total_requests += 1
-            
-            # Check rate limit headers
-            remaining = response.headers.get('X-RateLimit-Remaining', 'N/A')
+        # Retries (other key, or same key after its cooldown) loop here
+        # instead of recursing, so long rate-limit storms can't grow the stack
+        while True:
+            # Get an available API key (will wait if rate limited or cooling down)
+            api_key, key_index = self.key_manager.get_key_with_rate_limit()
             
-            response.raise_for_status()
+            headers = {"x-apisports-key": api_key}
             
-            data = response.json()
-            
-            # Check for API errors
-            if data.get("errors"):
-                errors = data["errors"]
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=30)
+                with self._total_requests_lock:
+                    self.total_requests += 1
+                
+                # Track the daily quota the API reports on every response, so
+                # callers don't need a /status round-trip to check it
+                daily_remaining = response.headers.get(DAILY_REMAINING_HEADER, "")
+                if daily_remaining.isdigit():
+                    self.key_manager.daily_remaining[key_index] = int(daily_remaining)
+                
+                response.raise_for_status()
+                
+                # Parse the raw bytes directly (no intermediate decoded str);
+                # the same bytes are what gets cached
+                data = json.loads(response.content)
+                
+                # Check for API errors
+                errors = data.get("errors")
                 if errors:
-                    error_str = str(errors)
+                    error_kind = self._classify_errors(errors)
                     
                     # Handle suspended account - disable this key
-                    if "suspended" in error_str.lower() or "account is suspended" in error_str.lower():
+                    if error_kind == "suspended":
                         self.key_manager.disable_key(key_index, "Account suspended")
                         # Retry with another key if available
-                        if len(self.key_manager.disabled_keys) < len(self.key_manager.api_keys):
-                            return self._make_request(endpoint, params)
+                        if len(self.key_manager.disabled_keys) < self.key_manager.num_keys:
+                            continue
                         return {"response": []}
                     
-                    # Handle rate limit error - wait and retry
-                    if "rateLimit" in error_str or "rate limit" in error_str.lower() or "Too many requests" in error_str:
-                        print(f"  ⏳ Rate limit hit, waiting 60 seconds...")
-                        time.sleep(60)
-                        return self._make_request(endpoint, params)  # Retry after waiting
+                    # Handle rate limit error - cool this key down and retry
+                    if error_kind == "rate_limit":
+                        rate_limit_retries += 1
+                        if rate_limit_retries > MAX_RATE_LIMIT_RETRIES:
+                            logger.warning("  ⚠️ Still rate limited after %d retries, giving up", MAX_RATE_LIMIT_RETRIES)
+                            # Raise like the HTTP 429 path so batch callers see
+                            # a failure instead of an empty, "done" result
+                            raise RateLimitExhausted(
+                                f"Still rate limited after {MAX_RATE_LIMIT_RETRIES} retries: {endpoint}",
+                                response=response,
+                            )
+                        cooldown = self._retry_after(response, RATE_LIMIT_COOLDOWN_SECONDS)
+                        logger.debug("  ⏳ Rate limit hit on key #%d, cooling it down for %.0fs...", key_index + 1, cooldown)
+                        self.key_manager.cool_key(key_index, cooldown)
+                        continue
                         
-                    print(f"  ⚠️ API Error: {errors}")
+                    logger.warning("  ⚠️ API Error: %s", errors)
                     return {"response": []}
+                
+                # Only error-free responses are cached
+                self.key_manager.record_success(key_index)
+                self.cache.set(endpoint, params, response.content)
+                return data
+                
+            except requests.exceptions.HTTPError as e:
+                if e.response.status_code == 429:
+                    rate_limit_retries += 1
+                    cooldown = self._retry_after(e.response, HTTP_429_COOLDOWN_SECONDS)
+                    logger.debug("  ⚠️ HTTP 429 Too Many Requests on key #%d, cooling it down for %.0fs...", key_index + 1, cooldown)
+                    self.key_manager.cool_key(key_index, cooldown)
+                    if rate_limit_retries <= MAX_RATE_LIMIT_RETRIES:
+                        continue
+                elif e.response.status_code == 403:
+                    # Forbidden - likely suspended or invalid key
+                    self.key_manager.disable_key(key_index, "HTTP 403 Forbidden")
+                    if len(self.key_manager.disabled_keys) < self.key_manager.num_keys:
+                        continue
+                logger.error("  ❌ HTTP Error: %s", e)
+                raise
+            except requests.exceptions.RequestException as e:
+                logger.error("  ❌ Request Error: %s", e)
+                raise
+
+    @staticmethod
+    def _classify_errors(errors) -> Optional[str]:
+        """
+        Classify the "errors" field of an API response.
+        
+        The API returns a dict keyed by error type (e.g. {"token": ...},
+        {"rateLimit": ...}) when something went wrong, and an empty list
+        otherwise; a list of messages is also accepted.
+        
+        Returns:
+            "suspended", "rate_limit", or None for any other error
+        """
+        if isinstance(errors, dict):
+            if "rateLimit" in errors:
+                return "rate_limit"
+            messages = errors.values()
+        else:
+            messages = errors
+        
+        for message in messages:
+            message = str(message).lower()
+            if "suspended" in message:
+                return "suspended"
+            if "too many requests" in message or "rate limit" in message:
+                return "rate_limit"
+        return None
+
+    @staticmethod
+    def _retry_after(response: requests.Response, default: float) -> float:
+        """
+        Seconds to back off after a rate-limit response: the Retry-After
+        header when the API sends one, otherwise the default, plus up to 1s
+        of jitter so keys cooled at the same moment don't all retry together.
+        """
+        try:
+            seconds = float(response.headers.get("Retry-After", default))
+        except (TypeError, ValueError):
+            seconds = default
+        return seconds + random.uniform(0, 1)
+
+    def batch(
+        self,
+        calls: List[Tuple[str, Optional[Dict[str, Any]]]],
+        max_workers: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Make many requests concurrently so every API key's rate budget is used.
+        
+        Args:
+            calls: List of (endpoint, params) pairs
+            max_workers: Number of worker threads (default: BATCH_WORKERS_PER_KEY per API key)
+            return_exceptions: Return a failed call's exception in its slot
+                instead of raising it
             
-            return data
-            
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429:
-                print(f"  ⚠️ HTTP 429 Too Many Requests - waiting...")
-                time.sleep(10)
-            elif e.response.status_code == 403:
-                # Forbidden - likely suspended or invalid key
-                self.key_manager.disable_key(key_index, "HTTP 403 Forbidden")
-                if len(self.key_manager.disabled_keys) < len(self.key_manager.api_keys):
-                    return self._make_request(endpoint, params)
-            print(f"  ❌ HTTP Error: {e}")
-            raise
-        except requests.exceptions.RequestException as e:
-            print(f"  ❌ Request Error: {e}")
-            raise
+        Returns:
+            JSON responses (or exceptions) in the same order as calls
+        """
+        if max_workers is None:
+            max_workers = self.key_manager.num_keys * BATCH_WORKERS_PER_KEY
+        
+        def run(call: Tuple[str, Optional[Dict[str, Any]]]) -> Any:
+            try:
+                return self._make_request(*call)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(run, calls))
 
     def get_account_status(self, key_index: int = 0) -> Dict[str, Any]:
         """Get current API account status and remaining requests for a specific key."""
@@ -263,7 +579,7 @@ class APIFootballClient:
             )
             return response.json()
         except Exception as e:
-            print(f"Error checking status: {e}")
+            logger.warning("Error checking status: %s", e)
             return {}
 
     def get_all_keys_status(self) -> List[Dict[str, Any]]:
@@ -283,6 +599,20 @@ class APIFootballClient:
         """Get current rate limit status for all keys."""
         return self.key_manager.get_status()
 
+    def get_daily_remaining(self) -> Optional[int]:
+        """
+        Daily requests left across the enabled keys, from the quota headers
+        of recent responses. None if any enabled key hasn't reported yet.
+        """
+        remaining = [
+            self.key_manager.daily_remaining[i]
+            for i in range(self.key_manager.num_keys)
+            if i not in self.key_manager.disabled_keys
+        ]
+        if not remaining or None in remaining:
+            return None
+        return sum(remaining)
+
     def get_countries(self) -> List[Dict[str, Any]]:
         """Get all available countries."""
         response = self._make_request("countries")
@@ -463,5 +793,30 @@ class APIFootballClient:
         return response.get("response", [])
 
 
-# Singleton instance
-api_client = APIFootballClient()
+_client: Optional[APIFootballClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> APIFootballClient:
+    """Return the shared API client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = APIFootballClient()
+    return _client
+
+
+class _LazyAPIClient:
+    """
+    Stand-in for the shared client that builds it on first attribute access,
+    so `from api_client import api_client` doesn't read API keys or open a
+    session until a request is actually made.
+    """
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_client(), name)
+
+
+# Singleton instance (created lazily)
+api_client = _LazyAPIClient()
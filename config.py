@@ -14,20 +14,19 @@ def get_api_keys() -> List[str]:
     Get all API keys from environment variables.
     Supports single key (API_FOOTBALL_KEY) or multiple keys (API_FOOTBALL_KEY_1, API_FOOTBALL_KEY_2, etc.)
     """
-    keys = []
+    # One pass over the environment; the single key comes first (most common
+    # case), then numbered keys in numeric order
+    found = []
+    for name, key in os.environ.items():
+        if not key or key == "your_api_key_here":
+            continue
+        if name == "API_FOOTBALL_KEY":
+            found.append((0, key))
+        elif name.startswith("API_FOOTBALL_KEY_") and name[17:].isdigit():
+            found.append((int(name[17:]), key))
     
-    # Check for single key first (most common case)
-    key = os.getenv("API_FOOTBALL_KEY", "")
-    if key and key != "your_api_key_here":
-        keys.append(key)
-    
-    # Also check for numbered keys (API_FOOTBALL_KEY_1, API_FOOTBALL_KEY_2, etc.)
-    for i in range(1, 10):
-        key = os.getenv(f"API_FOOTBALL_KEY_{i}", "")
-        if key and key != "your_api_key_here" and key not in keys:
-            keys.append(key)
-    
-    return keys
+    # Drop duplicate keys, keeping the first occurrence
+    return list(dict.fromkeys(key for _, key in sorted(found)))
 
 
 # API-Football Configuration
@@ -39,6 +38,9 @@ API_FOOTBALL_BASE_URL = f"https://{API_FOOTBALL_HOST}"
 # IMPORTANT: Adjust this based on your subscription plan
 REQUESTS_PER_KEY_PER_MINUTE = int(os.getenv("REQUESTS_PER_KEY_PER_MINUTE", 10))
 
+# API client log level; rate-limit waits and cooldowns are logged at DEBUG
+API_LOG_LEVEL = os.getenv("API_LOG_LEVEL", "INFO").upper()
+
 # World Cup Configuration
 WORLD_CUP_LEAGUE_ID = 1  # FIFA World Cup league ID in API-Football
 WORLD_CUP_2026_YEAR = 2026
@@ -147,6 +149,11 @@ TEAMS_OUTPUT_DIR = f"{OUTPUT_DIR}/teams"
 PLAYERS_OUTPUT_DIR = f"{OUTPUT_DIR}/players"
 STATISTICS_OUTPUT_DIR = f"{OUTPUT_DIR}/statistics"
 
+# On-disk cache of successful API responses so re-runs don't spend quota
+# Set API_CACHE_TTL_SECONDS=0 to disable caching
+API_CACHE_DIR = f"{OUTPUT_DIR}/.api_cache"
+API_CACHE_TTL_SECONDS = int(os.getenv("API_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+
 # Player statistics fields - comprehensive list matching API response
 PLAYER_STATS_FIELDS = [
     # Player info
@@ -219,6 +226,23 @@ PLAYER_STATS_FIELDS = [
     "penalty_saved",
 ]
 
+# Column dtypes for player statistics DataFrames. Counts use pandas' nullable
+# integer types (the API returns null for missing stats) so they stay compact
+# integers instead of falling back to float64/object columns.
+PLAYER_STATS_DTYPES = {
+    "player_id": "Int32",
+    "age": "Int16",
+    "team_id": "Int32",
+    "league_id": "Int32",
+    "season": "Int16",
+    "rating": "float64",
+    **{
+        field: "Int32"
+        for field in PLAYER_STATS_FIELDS[PLAYER_STATS_FIELDS.index("appearances"):]
+        if field not in ("rating", "captain")
+    },
+}
+
 # Squad player fields (from /players/squads endpoint)
 SQUAD_PLAYER_FIELDS = [
     "player_id",
@@ -6,58 +6,183 @@ Then enhance ALL 4+1 CSV files with ML-ready features and data cleaning.
 """
 import pandas as pd
 import numpy as np
-import time
+import csv
+import functools
 import json
 import os
 from api_client import api_client
 
 DATA_DIR = 'data/world_cup_history'
 
+
+def read_dataset(name, columns=None):
+    """
+    Read DATA_DIR/<name>.csv through a Parquet cache next to it.
+    
+    The CSVs stay the published format; the cache is rebuilt whenever the
+    CSV is newer, so each CSV is parsed once per rewrite no matter how many
+    steps read it.
+    
+    Args:
+        name: Dataset file name without extension
+        columns: Only load these columns (read straight from the column chunks)
+    """
+    csv_path = f'{DATA_DIR}/{name}.csv'
+    parquet_path = f'{DATA_DIR}/{name}.parquet'
+    if (not os.path.exists(parquet_path)
+            or os.path.getmtime(parquet_path) < os.path.getmtime(csv_path)):
+        pd.read_csv(csv_path).to_parquet(parquet_path, index=False)
+    return pd.read_parquet(parquet_path, columns=columns)
+
+
+def save_dataset(df, name):
+    """
+    Write DATA_DIR/<name>.csv and refresh its Parquet cache from the frame
+    in memory, so the next read_dataset() doesn't re-parse the CSV just written.
+    """
+    df.to_csv(f'{DATA_DIR}/{name}.csv', index=False)
+    df.to_parquet(f'{DATA_DIR}/{name}.parquet', index=False)
+
+
+@functools.lru_cache(maxsize=1)
+def get_matches():
+    """
+    Load the matches dataset once per process and share it between steps.
+    
+    Callers must not modify the returned frame (copy it first); anything that
+    rewrites the matches file must call get_matches.cache_clear().
+    """
+    return read_dataset('world_cup_matches')
+
 # ========================================================================
 # STEP 1: Scrape team match statistics for 2018+2022
 # ========================================================================
+def append_csv_rows(output_file, fieldnames, rows):
+    """
+    Append rows to a CSV, writing the header if the file is new.
+    
+    Stat columns come from the API, so a row may bring a column the file
+    doesn't have yet; in that (rare) case the file is rewritten once with
+    the wider header.
+    
+    Args:
+        output_file: CSV path
+        fieldnames: Current header (extended in place with new columns)
+        rows: List of row dicts
+    """
+    new_columns = [c for c in dict.fromkeys(k for row in rows for k in row) if c not in fieldnames]
+    if new_columns and fieldnames and os.path.exists(output_file):
+        # Rewrite the values as read (a pandas round trip would turn integer
+        # columns with gaps into floats), then move the wider file into place
+        tmp_file = f'{output_file}.tmp'
+        with open(output_file, 'r', newline='') as src, open(tmp_file, 'w', newline='') as dst:
+            writer = csv.DictWriter(dst, fieldnames=fieldnames + new_columns)
+            writer.writeheader()
+            writer.writerows(csv.DictReader(src))
+        os.replace(tmp_file, output_file)
+    fieldnames.extend(new_columns)
+    
+    write_header = not os.path.exists(output_file) or os.path.getsize(output_file) == 0
+    with open(output_file, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        if write_header:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+# Column name for each API stat type, filled in as new types are seen (the
+# API only uses a couple dozen, so each is normalized once per run)
+STAT_COLUMNS = {}
+
+
+def stat_column(stat_type):
+    """Normalize an API stat type (e.g. 'Passes %') to a column name ('passes_pct')."""
+    col_name = STAT_COLUMNS.get(stat_type)
+    if col_name is None:
+        col_name = stat_type.lower().replace(' ', '_').replace('%', 'pct')
+        STAT_COLUMNS[stat_type] = col_name
+    return col_name
+
+
+def fetch_fixture_statistics(fixture_ids, chunk_size=20):
+    """
+    Fetch fixtures/statistics for many fixtures, a chunk at a time in parallel.
+    
+    The API client's key manager enforces the per-key rate limits, so the
+    requests in a chunk run concurrently across all keys.
+    
+    Yields:
+        (fixture_id, statistics list or the exception raised for it), in order
+    """
+    for start in range(0, len(fixture_ids), chunk_size):
+        chunk = fixture_ids[start:start + chunk_size]
+        responses = api_client.batch(
+            [("fixtures/statistics", {"fixture": fid}) for fid in chunk],
+            return_exceptions=True,
+        )
+        for fid, response in zip(chunk, responses):
+            if isinstance(response, Exception):
+                yield fid, response
+            else:
+                yield fid, response.get("response", [])
+
+
+# Match columns each team stats row copies from the matches file
+MATCH_CONTEXT_COLUMNS = [
+    'fixture_id', 'world_cup_year', 'date', 'round',
+    'home_team_id', 'home_team_name', 'away_team_id', 'away_team_name',
+    'home_goals', 'away_goals',
+]
+
+
 def scrape_team_stats():
     """Scrape team-level match statistics for all 2018+2022 fixtures."""
-    matches = pd.read_csv(f'{DATA_DIR}/world_cup_matches.csv')
-    fixtures_2018_2022 = matches[matches['world_cup_year'].isin([2018, 2022])].sort_values('fixture_id')
-    fixture_ids = fixtures_2018_2022['fixture_id'].unique()
+    matches = get_matches()
+    # Filter and project together so only the columns the loop reads are
+    # copied out of the (shared) matches frame
+    fixtures_2018_2022 = matches.loc[
+        matches['world_cup_year'].isin([2018, 2022]), MATCH_CONTEXT_COLUMNS
+    ].sort_values('fixture_id')
+    fixture_ids = [int(fid) for fid in fixtures_2018_2022['fixture_id'].unique()]
+    # One row per fixture, looked up by id instead of scanning matches each time
+    match_by_id = {
+        int(m['fixture_id']): m
+        for m in fixtures_2018_2022.drop_duplicates('fixture_id').to_dict('records')
+    }
     
     print(f"Scraping team stats for {len(fixture_ids)} fixtures (2018+2022)...")
     
-    # Check if we have a progress file
+    # The progress file only marks an unfinished scrape; which fixtures are
+    # done is read from the CSV itself, since rows are streamed to it one
+    # fixture at a time and only successful fixtures are written
     progress_file = f'{DATA_DIR}/team_stats_progress.json'
-    if os.path.exists(progress_file):
-        with open(progress_file) as f:
-            completed = set(json.load(f))
-        print(f"  Resuming: {len(completed)} already done")
-    else:
-        completed = set()
-    
-    rows = []
-    
-    # Load any existing partial data
     output_file = f'{DATA_DIR}/world_cup_team_match_stats.csv'
-    if os.path.exists(output_file) and completed:
-        existing = pd.read_csv(output_file)
-        rows = existing.to_dict('records')
-        print(f"  Loaded {len(rows)} existing rows")
-    
-    for i, fid in enumerate(fixture_ids):
-        if fid in completed:
-            continue
-        
-        match = matches[matches['fixture_id'] == fid].iloc[0]
+    completed = set()
+    fieldnames = []
+    if os.path.exists(progress_file) and os.path.exists(output_file):
+        existing = pd.read_csv(output_file, usecols=['fixture_id'])
+        fieldnames = pd.read_csv(output_file, nrows=0).columns.tolist()
+        completed.update(int(x) for x in existing['fixture_id'].unique())
+        print(f"  Resuming: {len(completed)} already done ({len(existing)} existing rows)")
+    else:
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        with open(progress_file, 'w') as f:
+            json.dump([], f)
+    
+    pending = [fid for fid in fixture_ids if fid not in completed]
+    for fid, data in fetch_fixture_statistics(pending):
+        match = match_by_id[fid]
         
-        try:
-            data = api_client.get_fixture_statistics(fid)
-        except Exception as e:
-            print(f"  ❌ Error on fixture {fid}: {e}")
+        if isinstance(data, Exception):
+            print(f"  ❌ Error on fixture {fid}: {data}")
             continue
         
         if not data:
             print(f"  ⚠️  No stats for fixture {fid}")
             continue
         
+        rows = []
         for team_data in data:
             team_id = team_data['team']['id']
             team_name = team_data['team']['name']
@@ -74,14 +199,12 @@ def scrape_team_stats():
                 value = s['value']
                 
                 # Convert percentage strings to floats
-                if isinstance(value, str) and value.endswith('%'):
-                    value = float(value.replace('%', ''))
-                elif value is None:
+                if value is None:
                     value = 0  # API returns null for 0 in some stats
+                elif type(value) is str and value[-1:] == '%':
+                    value = float(value[:-1])
                 
-                # Normalize stat name to column-friendly format
-                col_name = stat_type.lower().replace(' ', '_').replace('%', 'pct')
-                stats[col_name] = value
+                stats[stat_column(stat_type)] = value
             
             row = {
                 'fixture_id': fid,
@@ -99,23 +222,15 @@ def scrape_team_stats():
             }
             rows.append(row)
         
-        completed.add(int(fid))
+        append_csv_rows(output_file, fieldnames, rows)
+        completed.add(fid)
         
-        # Save progress every 20 fixtures
         if len(completed) % 20 == 0:
-            df = pd.DataFrame(rows)
-            df.to_csv(output_file, index=False)
-            with open(progress_file, 'w') as f:
-                json.dump([int(x) for x in completed], f)
             print(f"  Progress: {len(completed)}/{len(fixture_ids)} fixtures")
-        
-        # Brief pause to be nice to the API
-        if (i + 1) % 10 == 0:
-            time.sleep(0.5)
     
-    # Final save
-    df = pd.DataFrame(rows)
-    df.to_csv(output_file, index=False)
+    # Read back once for the summary (and the caller); this also primes the
+    # Parquet cache the final pipeline summary reads
+    df = read_dataset('world_cup_team_match_stats') if os.path.exists(output_file) else pd.DataFrame()
     print(f"\n✅ Saved {len(df)} rows to {output_file}")
     print(f"   ({len(df)//2} fixtures × 2 teams)")
     print(f"   Columns: {list(df.columns)}")
@@ -130,9 +245,30 @@ def scrape_team_stats():
 # ========================================================================
 # STEP 2: Enhance player_match_stats - fill nulls with 0s for appeared players
 # ========================================================================
+def ratio_column(numerator, denominator, scale, decimals):
+    """
+    Compute round(numerator / denominator * scale, decimals), NaN where the
+    denominator is not positive.
+    
+    Only rows with a positive denominator are divided, so there is no
+    full-length temporary for the discarded branch as with np.where.
+    """
+    num = numerator.to_numpy(dtype=np.float64)
+    den = denominator.to_numpy(dtype=np.float64)
+    out = np.full(len(den), np.nan)
+    valid = den > 0
+    # Divide, scale and round in one buffer (in-place ops, no temporaries);
+    # rounding stays because the published CSVs carry these exact values
+    ratio = np.divide(num[valid], den[valid])
+    ratio *= scale
+    np.round(ratio, decimals, out=ratio)
+    out[valid] = ratio
+    return out
+
+
 def enhance_player_stats():
     """Fill null values with 0 for appeared players (API returns null for 0)."""
-    ps = pd.read_csv(f'{DATA_DIR}/world_cup_player_match_stats.csv')
+    ps = read_dataset('world_cup_player_match_stats')
     print(f"\nEnhancing player_match_stats ({len(ps)} rows)...")
     
     # Columns where null should be 0 for appeared players
@@ -150,47 +286,23 @@ def enhance_player_stats():
     ]
     
     appeared = ps['appeared'] == True
-    filled_count = 0
-    for col in stat_cols:
-        if col in ps.columns:
-            nulls_before = ps.loc[appeared, col].isnull().sum()
-            ps.loc[appeared, col] = ps.loc[appeared, col].fillna(0)
-            filled_count += nulls_before
+    existing_cols = [col for col in stat_cols if col in ps.columns]
+    
+    # One 2-D mask (null AND appeared) over all stat columns at once
+    fill_mask = ps[existing_cols].isna().to_numpy() & appeared.to_numpy()[:, None]
+    filled_count = int(fill_mask.sum())
+    ps[existing_cols] = ps[existing_cols].mask(fill_mask, 0)
     
     print(f"  Filled {filled_count} null values with 0 for appeared players")
     
     # Add derived ratio columns for ML
     eps = 1e-10  # avoid division by zero
-    ps['pass_accuracy_pct'] = np.where(
-        ps['passes_total'] > 0,
-        (ps['passes_accuracy'] / ps['passes_total'] * 100).round(1),
-        np.nan
-    )
-    ps['duel_win_pct'] = np.where(
-        ps['duels_total'] > 0,
-        (ps['duels_won'] / ps['duels_total'] * 100).round(1),
-        np.nan
-    )
-    ps['dribble_success_pct'] = np.where(
-        ps['dribbles_attempts'] > 0,
-        (ps['dribbles_success'] / ps['dribbles_attempts'] * 100).round(1),
-        np.nan
-    )
-    ps['shot_accuracy_pct'] = np.where(
-        ps['shots_total'] > 0,
-        (ps['shots_on_target'] / ps['shots_total'] * 100).round(1),
-        np.nan
-    )
-    ps['goals_per_shot'] = np.where(
-        ps['shots_total'] > 0,
-        (ps['goals_scored'] / ps['shots_total']).round(3),
-        np.nan
-    )
-    ps['minutes_per_goal'] = np.where(
-        ps['goals_scored'] > 0,
-        (ps['minutes_played'] / ps['goals_scored']).round(1),
-        np.nan
-    )
+    ps['pass_accuracy_pct'] = ratio_column(ps['passes_accuracy'], ps['passes_total'], 100, 1)
+    ps['duel_win_pct'] = ratio_column(ps['duels_won'], ps['duels_total'], 100, 1)
+    ps['dribble_success_pct'] = ratio_column(ps['dribbles_success'], ps['dribbles_attempts'], 100, 1)
+    ps['shot_accuracy_pct'] = ratio_column(ps['shots_on_target'], ps['shots_total'], 100, 1)
+    ps['goals_per_shot'] = ratio_column(ps['goals_scored'], ps['shots_total'], 1, 3)
+    ps['minutes_per_goal'] = ratio_column(ps['minutes_played'], ps['goals_scored'], 1, 1)
     
     # Defensive contribution score (tackles + interceptions + blocks)
     ps['defensive_actions'] = ps['tackles_total'] + ps['tackles_interceptions'] + ps['tackles_blocks']
@@ -207,17 +319,13 @@ def enhance_player_stats():
         ('dribbles_success', 'successful_dribbles_per_90'),
         ('fouls_committed', 'fouls_committed_per_90'),
     ]:
-        ps[per90_col] = np.where(
-            ps['minutes_played'] > 0,
-            (ps[col] / ps['minutes_played'] * 90).round(3),
-            np.nan
-        )
+        ps[per90_col] = ratio_column(ps[col], ps['minutes_played'], 90, 3)
     
     print(f"  Added derived columns: pass_accuracy_pct, duel_win_pct, dribble_success_pct,")
     print(f"    shot_accuracy_pct, goals_per_shot, minutes_per_goal, defensive_actions,")
     print(f"    attacking_actions, plus 6 per-90 stats")
     
-    ps.to_csv(f'{DATA_DIR}/world_cup_player_match_stats.csv', index=False)
+    save_dataset(ps, 'world_cup_player_match_stats')
     print(f"  ✅ Saved ({len(ps)} rows × {len(ps.columns)} cols)")
     return ps
 
@@ -227,45 +335,56 @@ def enhance_player_stats():
 # ========================================================================
 def enhance_matches():
     """Add ML-ready derived features to matches."""
-    m = pd.read_csv(f'{DATA_DIR}/world_cup_matches.csv')
+    m = get_matches().copy()
     print(f"\nEnhancing matches ({len(m)} rows)...")
     
     # Date-based features
-    m['date'] = pd.to_datetime(m['date'])
-    m['day_of_week'] = m['date'].dt.day_name()
-    m['match_month'] = m['date'].dt.month
-    m['match_hour'] = m['date'].dt.hour
+    # Dates are always ISO 8601 from the API; saying so skips per-value format inference
+    # Parse once and reuse one accessor for every field; the date column
+    # itself goes straight back to its canonical string form for the CSV
+    dates = pd.to_datetime(m['date'], format='ISO8601').dt
+    m['day_of_week'] = dates.day_name()
+    m['match_month'] = dates.month
+    m['match_hour'] = dates.hour
+    m['date'] = dates.strftime('%Y-%m-%dT%H:%M:%S+00:00')
     
     # Match structure features
-    m['is_group_stage'] = m['round'].str.contains('Group', case=False, na=False)
+    # Only a handful of distinct round names exist; test each once, then map
+    rounds = m['round'].fillna('')
+    is_group_round = {name: 'group' in name.lower() for name in rounds.unique()}
+    m['is_group_stage'] = rounds.map(is_group_round).astype(bool)
     m['is_knockout'] = ~m['is_group_stage']
     
-    # Score features
-    m['total_goals'] = m['home_goals'] + m['away_goals']
-    m['goal_difference'] = (m['home_goals'] - m['away_goals']).abs()
-    m['home_goal_diff'] = m['home_goals'] - m['away_goals']
+    # Score features, all computed from the two raw goal arrays
+    home_goals = m['home_goals'].to_numpy()
+    away_goals = m['away_goals'].to_numpy()
+    total_goals = home_goals + away_goals
+    home_goal_diff = home_goals - away_goals
+    m['total_goals'] = total_goals
+    m['goal_difference'] = np.abs(home_goal_diff)
+    m['home_goal_diff'] = home_goal_diff
     
     # Match result from home perspective
-    m['match_result'] = np.where(
-        m['home_goals'] > m['away_goals'], 'home_win',
-        np.where(m['home_goals'] < m['away_goals'], 'away_win', 'draw')
+    m['match_result'] = np.select(
+        [home_goal_diff > 0, home_goal_diff < 0],
+        ['home_win', 'away_win'],
+        default='draw',
     )
     
     # Note: for knockout matches that went to ET/penalties, home_goals == away_goals 
     # means the match was a draw after extra time, decided by penalties
+    went_to_extra_time = m['went_to_extra_time'].fillna(False)
     m['decided_by_penalties'] = m['went_to_penalties'].fillna(False)
-    m['decided_by_extra_time'] = m['went_to_extra_time'].fillna(False) & ~m['decided_by_penalties']
-    m['decided_in_regular_time'] = ~m['went_to_extra_time'].fillna(False)
+    m['decided_by_extra_time'] = went_to_extra_time & ~m['decided_by_penalties']
+    m['decided_in_regular_time'] = ~went_to_extra_time
     
     # Is it a high-scoring or low-scoring match?
-    m['is_high_scoring'] = m['total_goals'] >= 4  # ~top 25%
-    m['is_clean_sheet_home'] = m['away_goals'] == 0
-    m['is_clean_sheet_away'] = m['home_goals'] == 0
+    m['is_high_scoring'] = total_goals >= 4  # ~top 25%
+    m['is_clean_sheet_home'] = away_goals == 0
+    m['is_clean_sheet_away'] = home_goals == 0
     
-    # Convert date back to string for CSV
-    m['date'] = m['date'].dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
-    
-    m.to_csv(f'{DATA_DIR}/world_cup_matches.csv', index=False)
+    save_dataset(m, 'world_cup_matches')
+    get_matches.cache_clear()
     print(f"  Added: day_of_week, match_month, match_hour, is_group_stage, is_knockout,")
     print(f"    total_goals, goal_difference, home_goal_diff, match_result,")
     print(f"    decided_by_*, is_high_scoring, is_clean_sheet_*")
@@ -276,41 +395,58 @@ def enhance_matches():
 # ========================================================================
 # STEP 4: Enhance events with more ML features
 # ========================================================================
+TIME_BUCKET_EDGES = np.array([0, 15, 30, 45, 60, 75, 90, 120, 999])
+TIME_BUCKET_LABELS = ['0-15', '16-30', '31-45', '46-60', '61-75', '76-90', '91-105', '106-120']
+
+
 def enhance_events():
     """Add time-based ML features to events."""
-    e = pd.read_csv(f'{DATA_DIR}/world_cup_events.csv')
+    e = read_dataset('world_cup_events')
     print(f"\nEnhancing events ({len(e)} rows)...")
     
-    # Time bucket features
-    e['time_bucket'] = pd.cut(
-        e['time_elapsed'].clip(lower=0),  # handle negative values
-        bins=[0, 15, 30, 45, 60, 75, 90, 120, 999],
-        labels=['0-15', '16-30', '31-45', '46-60', '61-75', '76-90', '91-105', '106-120'],
-        include_lowest=True
-    )
-    
-    e['is_first_half'] = (e['time_elapsed'] >= 0) & (e['time_elapsed'] <= 45)
-    e['is_second_half'] = (e['time_elapsed'] > 45) & (e['time_elapsed'] <= 90)
-    e['is_extra_time'] = e['time_elapsed'] > 90
+    # Time bucket features: right-closed bins (0-15 includes 0 and 15), the
+    # bin index found by one binary search per event
+    elapsed = e['time_elapsed'].to_numpy(dtype=np.float64)
+    codes = np.searchsorted(TIME_BUCKET_EDGES, np.clip(elapsed, 0, None), side='left') - 1
+    codes[codes == -1] = 0  # exactly 0 minutes belongs to the first bucket
+    codes[(codes >= len(TIME_BUCKET_LABELS)) | np.isnan(elapsed)] = -1  # -1 = missing
+    e['time_bucket'] = pd.Categorical.from_codes(codes, categories=TIME_BUCKET_LABELS, ordered=True)
+    
+    e['is_first_half'] = (elapsed >= 0) & (elapsed <= 45)
+    e['is_second_half'] = (elapsed > 45) & (elapsed <= 90)
+    e['is_extra_time'] = elapsed > 90
     e['is_injury_time'] = e['time_extra'].notna() & (e['time_extra'] > 0)
     e['is_late_event'] = e['time_elapsed'] >= 80  # late-game events (dramatic moments)
     
-    # Running goal difference at time of event (within each match)
-    # This is complex - we need to track score progression
-    goal_events = e[e['is_goal'] == True].copy()
-    
-    # For each fixture, compute the running score
-    matches = pd.read_csv(f'{DATA_DIR}/world_cup_matches.csv')
-    match_teams = {}
-    for _, row in matches.iterrows():
-        match_teams[row['fixture_id']] = {
-            'home_id': row['home_team_id'],
-            'away_id': row['away_team_id']
-        }
+    # Running score at each event (including the event itself), within each
+    # match. Goal events carry the credited team (own goals included), and
+    # shootout penalties don't count towards the score.
+    fixtures = get_matches().drop_duplicates('fixture_id').set_index('fixture_id')
+    home_id = e['fixture_id'].map(fixtures['home_team_id'])
+    away_id = e['fixture_id'].map(fixtures['away_team_id'])
+    counts = (e['is_goal'] == True) & (e['comments'] != 'Penalty Shootout')
+    
+    # Cumulative sums in match-time order (stoppage time after its minute),
+    # assigned back by index so the file keeps its row order
+    order = (e.assign(_extra=e['time_extra'].fillna(0))
+              .sort_values(['fixture_id', 'time_elapsed', '_extra'], kind='stable').index)
+    goals = pd.DataFrame({
+        'home_score_at_event': counts & (e['team_id'] == home_id),
+        'away_score_at_event': counts & (e['team_id'] == away_id),
+    }).astype(int).loc[order]
+    running = goals.groupby(e.loc[order, 'fixture_id'].to_numpy(), sort=False).cumsum()
+    e['home_score_at_event'] = running['home_score_at_event']
+    e['away_score_at_event'] = running['away_score_at_event']
+    e['team_goal_diff_at_event'] = np.where(
+        e['team_id'] == home_id,
+        e['home_score_at_event'] - e['away_score_at_event'],
+        e['away_score_at_event'] - e['home_score_at_event'],
+    )
     
-    e.to_csv(f'{DATA_DIR}/world_cup_events.csv', index=False)
+    save_dataset(e, 'world_cup_events')
     print(f"  Added: time_bucket, is_first_half, is_second_half, is_extra_time,")
-    print(f"    is_injury_time, is_late_event")
+    print(f"    is_injury_time, is_late_event, home/away_score_at_event,")
+    print(f"    team_goal_diff_at_event")
     print(f"  ✅ Saved ({len(e)} rows × {len(e.columns)} cols)")
     return e
 
@@ -320,47 +456,36 @@ def enhance_events():
 # ========================================================================
 def enhance_lineups():
     """Add useful features to lineups."""
-    l = pd.read_csv(f'{DATA_DIR}/world_cup_lineups.csv')
+    l = read_dataset('world_cup_lineups')
     print(f"\nEnhancing lineups ({len(l)} rows)...")
     
     # Add match context from matches file
-    matches = pd.read_csv(f'{DATA_DIR}/world_cup_matches.csv')
+    matches = get_matches()
+    
+    # Look up each row's fixture in the matches file (vectorized hash join)
+    fixtures = matches.drop_duplicates('fixture_id').set_index('fixture_id')
+    home_id = l['fixture_id'].map(fixtures['home_team_id'])
+    home_name = l['fixture_id'].map(fixtures['home_team_name'])
+    away_id = l['fixture_id'].map(fixtures['away_team_id'])
+    away_name = l['fixture_id'].map(fixtures['away_team_name'])
     
     # Determine if each player's team is home or away
-    home_map = dict(zip(matches['fixture_id'], matches['home_team_id']))
-    l['is_home'] = l.apply(lambda row: row['team_id'] == home_map.get(row['fixture_id']), axis=1)
+    is_home = (l['team_id'] == home_id).to_numpy()
+    l['is_home'] = is_home
     
     # Add opponent info
-    match_info = {}
-    for _, row in matches.iterrows():
-        match_info[row['fixture_id']] = {
-            'home_id': row['home_team_id'],
-            'home_name': row['home_team_name'],
-            'away_id': row['away_team_id'],
-            'away_name': row['away_team_name'],
-        }
-    
-    def get_opponent(row):
-        info = match_info.get(row['fixture_id'], {})
-        if row['team_id'] == info.get('home_id'):
-            return info.get('away_id'), info.get('away_name')
-        else:
-            return info.get('home_id'), info.get('home_name')
-    
-    opponents = l.apply(get_opponent, axis=1, result_type='expand')
-    l['opponent_id'] = opponents[0]
-    l['opponent_name'] = opponents[1]
-    
-    # Squad size per team per match
-    squad_size = l.groupby(['fixture_id', 'team_id']).size().reset_index(name='squad_size')
-    l = l.merge(squad_size, on=['fixture_id', 'team_id'], how='left')
-    
-    # Number of substitutes per team per match
-    sub_count = l[l['is_substitute'] == True].groupby(['fixture_id', 'team_id']).size().reset_index(name='num_substitutes')
-    l = l.merge(sub_count, on=['fixture_id', 'team_id'], how='left')
-    l['num_substitutes'] = l['num_substitutes'].fillna(0).astype(int)
-    
-    l.to_csv(f'{DATA_DIR}/world_cup_lineups.csv', index=False)
+    l['opponent_id'] = np.where(is_home, away_id, home_id)
+    l['opponent_name'] = np.where(is_home, away_name, home_name)
+    
+    # Squad size and number of substitutes per team per match, from one
+    # groupby broadcast back onto the rows (no merge, so re-running on an
+    # already enhanced file overwrites the columns instead of suffixing them)
+    is_sub = (l['is_substitute'] == True).astype(int)
+    per_team = is_sub.groupby([l['fixture_id'], l['team_id']], sort=False)
+    l['squad_size'] = per_team.transform('size')
+    l['num_substitutes'] = per_team.transform('sum')
+    
+    save_dataset(l, 'world_cup_lineups')
     print(f"  Added: is_home, opponent_id, opponent_name, squad_size, num_substitutes")
     print(f"  ✅ Saved ({len(l)} rows × {len(l.columns)} cols)")
     return l
@@ -399,10 +524,9 @@ if __name__ == '__main__':
     print("=" * 70)
     
     # Summary
-    for fname in ['world_cup_matches.csv', 'world_cup_lineups.csv', 
-                   'world_cup_events.csv', 'world_cup_player_match_stats.csv',
-                   'world_cup_team_match_stats.csv']:
-        fpath = f'{DATA_DIR}/{fname}'
-        if os.path.exists(fpath):
-            df = pd.read_csv(fpath)
-            print(f"  {fname}: {len(df)} rows × {len(df.columns)} cols")
+    for name in ['world_cup_matches', 'world_cup_lineups', 
+                 'world_cup_events', 'world_cup_player_match_stats',
+                 'world_cup_team_match_stats']:
+        if os.path.exists(f'{DATA_DIR}/{name}.csv'):
+            df = read_dataset(name)
+            print(f"  {name}.csv: {len(df)} rows × {len(df.columns)} cols")
@@ -20,16 +20,24 @@ import os
 import sys
 import json
 import glob
+import functools
+import re
 import time
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, List, Set, Tuple, Optional
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
 from tqdm import tqdm
 
 from dotenv import load_dotenv
 load_dotenv()
 
 from api_client import api_client
+from utils import WriteAheadLog
 from config import (
     SEASONS_TO_SCRAPE,
     PLAYERS_OUTPUT_DIR,
@@ -39,9 +47,58 @@ from config import (
 # All 22 seasons we want complete coverage for
 ALL_SEASONS = set(SEASONS_TO_SCRAPE)  # {2004, 2005, ..., 2025}
 
+# Seasons the historical scraper skipped; validation flags players still missing them
+GAP_CHECK_SEASONS = frozenset(range(2015, 2022))
+
 # Progress file for this repair run
 REPAIR_PROGRESS_FILE = "data/repair_progress.json"
 
+# Minimum seconds between periodic progress checkpoints
+PROGRESS_SAVE_INTERVAL_SECONDS = 5.0
+
+# Player-seasons fetched concurrently per batch
+REPAIR_BATCH_SIZE = 50
+
+# Teams repaired concurrently (they share the API client's key manager,
+# so the rate limits still hold across all of them)
+REPAIR_TEAM_WORKERS = 4
+
+# Column order of the per-team stats files
+STATS_COLUMNS = [
+    'player_id', 'player_name', 'firstname', 'lastname', 'nationality',
+    'birth_date', 'birth_place', 'birth_country', 'age', 'height', 'weight',
+    'injured', 'photo', 'season', 'team_id', 'team_name', 'league_id',
+    'league_name', 'league_country', 'position', 'appearances', 'lineups',
+    'minutes', 'rating', 'captain', 'substitutes_in', 'substitutes_out',
+    'substitutes_bench', 'shots_total', 'shots_on_target', 'goals',
+    'goals_conceded', 'assists', 'saves', 'passes_total', 'passes_key',
+    'passes_accuracy', 'tackles_total', 'tackles_blocks',
+    'tackles_interceptions', 'duels_total', 'duels_won', 'dribbles_attempts',
+    'dribbles_success', 'dribbles_past', 'fouls_drawn', 'fouls_committed',
+    'cards_yellow', 'cards_yellowred', 'cards_red', 'penalty_won',
+    'penalty_committed', 'penalty_scored', 'penalty_missed', 'penalty_saved',
+    'national_team_id', 'national_team_name'
+]
+
+# Everything but the digits of a height/weight string
+NON_DIGITS = re.compile(r'\D')
+
+# A stats row is unique per player + season + league + team
+STATS_KEY_COLUMNS = ['player_id', 'season', 'league_id', 'team_id']
+
+# Team stats files read concurrently when rebuilding the combined file
+REBUILD_READ_WORKERS = 8
+
+# Squad columns the repair needs
+SQUAD_COLUMNS = ['player_id', 'player_name']
+
+# Repetitive string columns held as categoricals while rebuilding the
+# combined stats file (much smaller, and faster to dedup and sort)
+CATEGORY_COLUMNS = [
+    'national_team_name', 'league_name', 'league_country', 'team_name',
+    'position', 'nationality',
+]
+
 # The 42 WC 2026 teams: mapping from file base name -> (national_team_id, national_team_name)
 # Built from the existing stats files (verified above)
 TEAM_REGISTRY = {
@@ -91,11 +148,32 @@ TEAM_REGISTRY = {
 
 
 class RepairProgressTracker:
-    """Track repair progress for safe resume."""
+    """
+    Track repair progress for safe resume.
+    
+    Scraped player-seasons and periodic checkpoints are appended to a
+    write-ahead log next to the progress file, so a checkpoint doesn't
+    rewrite the whole (growing) progress JSON. The log is replayed on load
+    and compacted into the JSON whenever a team is completed.
+    
+    Safe to share between the threads repairing different teams.
+    """
     
     def __init__(self, progress_file: str = REPAIR_PROGRESS_FILE):
         self.progress_file = progress_file
+        self.lock = threading.RLock()
+        self.wal = WriteAheadLog(f"{os.path.splitext(progress_file)[0]}.wal.jsonl")
+        self._last_save = 0.0
         self.progress = self._load()
+        # Membership is checked through sets; the JSON keeps lists
+        self._completed_set = set(self.progress["completed_teams"])
+        self._scraped_sets = {
+            key: set(seasons)
+            for key, seasons in self.progress["player_seasons_scraped"].items()
+        }
+        self._replay_wal()
+        # Don't lose the last (throttled) checkpoint on exit
+        atexit.register(self.close)
     
     def _load(self) -> dict:
         if os.path.exists(self.progress_file):
@@ -112,158 +190,238 @@ class RepairProgressTracker:
             "last_updated": None,
         }
     
-    def save(self):
-        self.progress["last_updated"] = datetime.now().isoformat()
-        with open(self.progress_file, 'w') as f:
-            json.dump(self.progress, f, indent=2)
+    def _replay_wal(self):
+        """Apply log entries written after the progress JSON was last compacted."""
+        for entry in self.wal.entries():
+            if "player_id" in entry:
+                self._add_scraped_season(entry["player_id"], entry["season"])
+            elif entry.get("last_updated", "") > (self.progress["last_updated"] or ""):
+                # Checkpoint newer than the JSON (older ones were compacted)
+                self.progress.update(entry)
+    
+    def save(self, force: bool = False):
+        """
+        Checkpoint the counters and flush scraped player-seasons to the log.
+        Skipped if the last checkpoint is under PROGRESS_SAVE_INTERVAL_SECONDS
+        old, unless force is set.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if not force and now - self._last_save < PROGRESS_SAVE_INTERVAL_SECONDS:
+                return
+            self._last_save = now
+            self.progress["last_updated"] = datetime.now().isoformat()
+            checkpoint = {
+                key: value for key, value in self.progress.items()
+                if key not in ("completed_teams", "player_seasons_scraped")
+            }
+            self.wal.append(checkpoint)
+    
+    def close(self):
+        """Write a final checkpoint if anything was logged since the last compaction."""
+        with self.lock:
+            if self.wal.is_open:
+                self.save(force=True)
+                self.wal.close()
+    
+    def compact(self):
+        """Rewrite the full progress JSON and start a new, empty log."""
+        with self.lock:
+            self.progress["last_updated"] = datetime.now().isoformat()
+            self.progress["player_seasons_scraped"] = {
+                key: sorted(seasons) for key, seasons in self._scraped_sets.items()
+            }
+            tmp_file = f"{self.progress_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(self.progress, f, indent=2)
+            os.replace(tmp_file, self.progress_file)
+            self.wal.clear()
     
     def is_team_completed(self, team_key: str) -> bool:
-        return team_key in self.progress["completed_teams"]
+        return team_key in self._completed_set
     
     def mark_team_completed(self, team_key: str):
-        if team_key not in self.progress["completed_teams"]:
-            self.progress["completed_teams"].append(team_key)
-        self.save()
+        with self.lock:
+            if team_key not in self._completed_set:
+                self._completed_set.add(team_key)
+                self.progress["completed_teams"].append(team_key)
+            self.compact()
     
     def get_player_scraped_seasons(self, player_id: int) -> Set[int]:
-        key = str(player_id)
-        return set(self.progress["player_seasons_scraped"].get(key, []))
+        with self.lock:
+            return set(self._scraped_sets.get(str(player_id), ()))
+    
+    def _add_scraped_season(self, player_id: int, season: int):
+        self._scraped_sets.setdefault(str(player_id), set()).add(season)
     
     def mark_player_season_scraped(self, player_id: int, season: int):
-        key = str(player_id)
-        if key not in self.progress["player_seasons_scraped"]:
-            self.progress["player_seasons_scraped"][key] = []
-        if season not in self.progress["player_seasons_scraped"][key]:
-            self.progress["player_seasons_scraped"][key].append(season)
+        with self.lock:
+            self._add_scraped_season(player_id, season)
+            self.wal.append({"player_id": player_id, "season": season}, flush=False)
     
     def add_api_calls(self, count: int):
-        self.progress["api_calls_made"] += count
+        with self.lock:
+            self.progress["api_calls_made"] += count
+    
+    def set_rate_stats(self, rate_stats: dict):
+        with self.lock:
+            self.progress["rate_stats"] = rate_stats
 
 
-def parse_height_weight(value) -> Optional[int]:
-    """Parse height/weight strings like '183 cm' or '72 kg' into integers."""
-    if value is None:
-        return None
-    if isinstance(value, (int, float)):
-        return int(value) if not pd.isna(value) else None
-    s = str(value).strip()
-    # Extract numeric part from strings like "183 cm" or "72 kg"
-    digits = ''.join(c for c in s if c.isdigit())
-    return int(digits) if digits else None
+def parse_height_weight(values: pd.Series) -> pd.Series:
+    """
+    Parse a column of height/weight values like '183 cm' or '72 kg' into
+    integers (missing or digit-less values become <NA>).
+    """
+    # The same few strings ('183 cm', '72 kg', ...) repeat across players,
+    # so each distinct value is parsed once and the results mapped back
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    
+    # Plain numbers are truncated; strings keep only their digits
+    numbers = pd.to_numeric(uniques, errors='coerce')
+    digits = uniques.astype('string').str.replace(NON_DIGITS, '', regex=True)
+    from_digits = pd.to_numeric(digits.mask(digits == ''), errors='coerce')
+    parsed = np.trunc(numbers.fillna(from_digits)).astype('Int64')
+    
+    # Missing values have code -1, which take() fills with <NA>
+    return pd.Series(parsed.array.take(codes, allow_fill=True), index=values.index)
 
 
-def scrape_player_season(player_id: int, season: int) -> List[dict]:
+def parse_player_season(
+    player_id: int,
+    season: int,
+    stats_response: List[dict],
+    columns: Dict[str, list],
+) -> int:
     """
-    Scrape a single player's stats for a single season.
-    Returns a list of stat row dicts (one per league the player participated in).
+    Parse a players endpoint response for a single player-season.
+    Appends one row per league the player participated in to the column
+    lists in `columns` (keyed by stat column name) and returns the row count.
     Uses the exact same parsing logic as scraper.py.
     """
-    try:
-        stats_response = api_client.get_player_statistics(player_id, season)
-        
-        if not stats_response:
-            return []
-        
-        player_data = stats_response[0]
-        player_info = player_data.get("player", {})
-        birth = player_info.get("birth", {})
-        
-        rows = []
-        for stat in player_data.get("statistics", []):
-            league = stat.get("league", {})
-            team = stat.get("team", {})
-            games = stat.get("games", {})
-            substitutes = stat.get("substitutes", {})
-            shots = stat.get("shots", {})
-            goals_data = stat.get("goals", {})
-            passes = stat.get("passes", {})
-            tackles = stat.get("tackles", {})
-            duels = stat.get("duels", {})
-            dribbles = stat.get("dribbles", {})
-            fouls = stat.get("fouls", {})
-            cards = stat.get("cards", {})
-            penalty = stat.get("penalty", {})
-            
-            rows.append({
-                # Player info
-                "player_id": player_info.get("id"),
-                "player_name": player_info.get("name"),
-                "firstname": player_info.get("firstname"),
-                "lastname": player_info.get("lastname"),
-                "nationality": player_info.get("nationality"),
-                "birth_date": birth.get("date"),
-                "birth_place": birth.get("place"),
-                "birth_country": birth.get("country"),
-                "age": player_info.get("age"),
-                "height": parse_height_weight(player_info.get("height")),
-                "weight": parse_height_weight(player_info.get("weight")),
-                "injured": player_info.get("injured"),
-                "photo": player_info.get("photo"),
-                # Team & League
-                "season": season,
-                "team_id": team.get("id"),
-                "team_name": team.get("name"),
-                "league_id": league.get("id"),
-                "league_name": league.get("name"),
-                "league_country": league.get("country"),
-                # Games
-                "position": games.get("position"),
-                "appearances": games.get("appearences"),  # API typo
-                "lineups": games.get("lineups"),
-                "minutes": games.get("minutes"),
-                "rating": games.get("rating"),
-                "captain": games.get("captain"),
-                # Substitutes
-                "substitutes_in": substitutes.get("in"),
-                "substitutes_out": substitutes.get("out"),
-                "substitutes_bench": substitutes.get("bench"),
-                # Shooting
-                "shots_total": shots.get("total"),
-                "shots_on_target": shots.get("on"),
-                # Goals
-                "goals": goals_data.get("total"),
-                "goals_conceded": goals_data.get("conceded"),
-                "assists": goals_data.get("assists"),
-                "saves": goals_data.get("saves"),
-                # Passing
-                "passes_total": passes.get("total"),
-                "passes_key": passes.get("key"),
-                "passes_accuracy": passes.get("accuracy"),
-                # Defensive
-                "tackles_total": tackles.get("total"),
-                "tackles_blocks": tackles.get("blocks"),
-                "tackles_interceptions": tackles.get("interceptions"),
-                # Duels
-                "duels_total": duels.get("total"),
-                "duels_won": duels.get("won"),
-                # Dribbles
-                "dribbles_attempts": dribbles.get("attempts"),
-                "dribbles_success": dribbles.get("success"),
-                "dribbles_past": dribbles.get("past"),
-                # Fouls
-                "fouls_drawn": fouls.get("drawn"),
-                "fouls_committed": fouls.get("committed"),
-                # Cards
-                "cards_yellow": cards.get("yellow"),
-                "cards_yellowred": cards.get("yellowred"),
-                "cards_red": cards.get("red"),
-                # Penalties
-                "penalty_won": penalty.get("won"),
-                "penalty_committed": penalty.get("commited"),  # API typo
-                "penalty_scored": penalty.get("scored"),
-                "penalty_missed": penalty.get("missed"),
-                "penalty_saved": penalty.get("saved"),
-            })
+    if not stats_response:
+        return 0
+    
+    player_data = stats_response[0]
+    player_info = player_data.get("player", {})
+    birth = player_info.get("birth", {})
+    
+    # Player info is the same on every row of this player-season
+    player_row = {
+        "player_id": player_info.get("id"),
+        "player_name": player_info.get("name"),
+        "firstname": player_info.get("firstname"),
+        "lastname": player_info.get("lastname"),
+        "nationality": player_info.get("nationality"),
+        "birth_date": birth.get("date"),
+        "birth_place": birth.get("place"),
+        "birth_country": birth.get("country"),
+        "age": player_info.get("age"),
+        "height": player_info.get("height"),  # Parsed per column in repair_team
+        "weight": player_info.get("weight"),
+        "injured": player_info.get("injured"),
+        "photo": player_info.get("photo"),
+    }
+    
+    num_rows = 0
+    for stat in player_data.get("statistics", []):
+        league = stat.get("league", {})
+        team = stat.get("team", {})
+        games = stat.get("games", {})
+        substitutes = stat.get("substitutes", {})
+        shots = stat.get("shots", {})
+        goals_data = stat.get("goals", {})
+        passes = stat.get("passes", {})
+        tackles = stat.get("tackles", {})
+        duels = stat.get("duels", {})
+        dribbles = stat.get("dribbles", {})
+        fouls = stat.get("fouls", {})
+        cards = stat.get("cards", {})
+        penalty = stat.get("penalty", {})
         
-        return rows
+        stat_row = {
+            # Team & League
+            "season": season,
+            "team_id": team.get("id"),
+            "team_name": team.get("name"),
+            "league_id": league.get("id"),
+            "league_name": league.get("name"),
+            "league_country": league.get("country"),
+            # Games
+            "position": games.get("position"),
+            "appearances": games.get("appearences"),  # API typo
+            "lineups": games.get("lineups"),
+            "minutes": games.get("minutes"),
+            "rating": games.get("rating"),
+            "captain": games.get("captain"),
+            # Substitutes
+            "substitutes_in": substitutes.get("in"),
+            "substitutes_out": substitutes.get("out"),
+            "substitutes_bench": substitutes.get("bench"),
+            # Shooting
+            "shots_total": shots.get("total"),
+            "shots_on_target": shots.get("on"),
+            # Goals
+            "goals": goals_data.get("total"),
+            "goals_conceded": goals_data.get("conceded"),
+            "assists": goals_data.get("assists"),
+            "saves": goals_data.get("saves"),
+            # Passing
+            "passes_total": passes.get("total"),
+            "passes_key": passes.get("key"),
+            "passes_accuracy": passes.get("accuracy"),
+            # Defensive
+            "tackles_total": tackles.get("total"),
+            "tackles_blocks": tackles.get("blocks"),
+            "tackles_interceptions": tackles.get("interceptions"),
+            # Duels
+            "duels_total": duels.get("total"),
+            "duels_won": duels.get("won"),
+            # Dribbles
+            "dribbles_attempts": dribbles.get("attempts"),
+            "dribbles_success": dribbles.get("success"),
+            "dribbles_past": dribbles.get("past"),
+            # Fouls
+            "fouls_drawn": fouls.get("drawn"),
+            "fouls_committed": fouls.get("committed"),
+            # Cards
+            "cards_yellow": cards.get("yellow"),
+            "cards_yellowred": cards.get("yellowred"),
+            "cards_red": cards.get("red"),
+            # Penalties
+            "penalty_won": penalty.get("won"),
+            "penalty_committed": penalty.get("commited"),  # API typo
+            "penalty_scored": penalty.get("scored"),
+            "penalty_missed": penalty.get("missed"),
+            "penalty_saved": penalty.get("saved"),
+        }
         
+        for name, value in player_row.items():
+            columns[name].append(value)
+        for name, value in stat_row.items():
+            columns[name].append(value)
+        num_rows += 1
+    
+    return num_rows
+
+
+def scrape_player_season(player_id: int, season: int, columns: Dict[str, list]) -> int:
+    """
+    Scrape a single player's stats for a single season.
+    Appends the stat rows to the column lists in `columns` and returns the row count.
+    """
+    try:
+        stats_response = api_client.get_player_statistics(player_id, season)
     except Exception as e:
         print(f"    ⚠️ API error for player {player_id} season {season}: {e}")
-        return []
+        return 0
+    return parse_player_season(player_id, season, stats_response, columns)
 
 
+@functools.lru_cache(maxsize=None)
 def get_squad_file_for_team(team_key: str) -> Optional[str]:
-    """Find the squad file path for a team key."""
+    """Find the squad file path for a team key (squad files don't change during a run)."""
     # Direct match
     path = f"{PLAYERS_OUTPUT_DIR}/{team_key}_squad.csv"
     if os.path.exists(path):
@@ -274,56 +432,115 @@ def get_squad_file_for_team(team_key: str) -> Optional[str]:
     return None
 
 
+@functools.lru_cache(maxsize=None)
 def get_stats_file_for_team(team_key: str) -> str:
     """Get the stats file path for a team key."""
     return f"{STATISTICS_OUTPUT_DIR}/{team_key}_player_statistics.csv"
 
 
+def read_csv_cached(csv_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a CSV through a Parquet cache next to it.
+    
+    The CSV stays the published format; the cache is rebuilt whenever the
+    CSV is newer (e.g. rewritten by the scraper), so each file is parsed
+    once per rewrite no matter how many runs read it.
+    
+    Args:
+        csv_path: Path of the CSV file
+        columns: Only load these columns
+    """
+    parquet_path = f"{os.path.splitext(csv_path)[0]}.parquet"
+    if (not os.path.exists(parquet_path)
+            or os.path.getmtime(parquet_path) < os.path.getmtime(csv_path)):
+        pd.read_csv(csv_path).to_parquet(parquet_path, index=False)
+    return pd.read_parquet(parquet_path, columns=columns)
+
+
+def get_seasons_index_file_for_team(team_key: str) -> str:
+    """Get the path of the player -> seasons index kept next to a team's stats file."""
+    return f"{STATISTICS_OUTPUT_DIR}/{team_key}_player_seasons.json"
+
+
+def load_existing_seasons(team_key: str) -> Tuple[int, Dict[int, frozenset]]:
+    """
+    Get the number of existing stats rows for a team and the seasons each
+    player already has.
+    
+    The result is stored in a small JSON index tagged with the stats file's
+    mtime, so resumed runs skip reading the stats file until it changes.
+    
+    Returns:
+        (row_count, {player_id: frozenset of seasons})
+    """
+    stats_path = get_stats_file_for_team(team_key)
+    if not os.path.exists(stats_path):
+        return 0, {}
+    
+    index_path = get_seasons_index_file_for_team(team_key)
+    stats_mtime = os.path.getmtime(stats_path)
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        if index["stats_mtime"] == stats_mtime:
+            return index["rows"], {
+                int(pid): frozenset(seasons) for pid, seasons in index["seasons"].items()
+            }
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    existing_stats = read_csv_cached(stats_path, columns=['player_id', 'season'])
+    # One groupby, not one scan of the stats per squad player
+    existing_seasons = {
+        int(pid): frozenset(int(season) for season in seasons)
+        for pid, seasons in existing_stats.groupby('player_id')['season'].agg(frozenset).items()
+    }
+    
+    with open(index_path, 'w') as f:
+        json.dump({
+            "stats_mtime": stats_mtime,
+            "rows": len(existing_stats),
+            "seasons": {str(pid): sorted(seasons) for pid, seasons in existing_seasons.items()},
+        }, f)
+    
+    return len(existing_stats), existing_seasons
+
+
 def analyze_team_gaps(
     team_key: str, 
     national_team_id: int, 
     national_team_name: str
-) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[int, Set[int]]]:
+) -> Tuple[pd.DataFrame, int, Dict[int, Set[int]]]:
     """
     Analyze what's missing for a team.
     
+    Only the seasons index of the existing stats is loaded; repair_team reads
+    the full stats file once it has new rows to merge into it.
+    
     Returns:
-        (squad_df, existing_stats_df, missing_dict)
+        (squad_df, existing_row_count, missing_dict)
         missing_dict: {player_id: set of missing seasons}
     """
     # Load squad
     squad_path = get_squad_file_for_team(team_key)
     if squad_path is None:
         print(f"  ❌ No squad file found for {team_key}")
-        return pd.DataFrame(), pd.DataFrame(), {}
+        return pd.DataFrame(), 0, {}
     
-    squad_df = pd.read_csv(squad_path)
+    squad_df = read_csv_cached(squad_path, columns=SQUAD_COLUMNS)
     
-    # Load existing stats (may not exist or may be empty)
-    stats_path = get_stats_file_for_team(team_key)
-    if os.path.exists(stats_path):
-        existing_stats = pd.read_csv(stats_path)
-    else:
-        existing_stats = pd.DataFrame()
+    # Seasons each player already has (no stats file or no rows means every
+    # player needs all seasons)
+    existing_rows, existing_seasons = load_existing_seasons(team_key)
     
     # For each squad player, determine which seasons are missing
     missing = {}
+    for pid in squad_df['player_id'].astype(int).unique().tolist():
+        gaps = ALL_SEASONS - existing_seasons.get(pid, frozenset())
+        if gaps:
+            missing[pid] = gaps
     
-    for _, player in squad_df.iterrows():
-        pid = int(player['player_id'])
-        
-        if existing_stats.empty:
-            # No data at all — need all seasons
-            missing[pid] = ALL_SEASONS.copy()
-        else:
-            # Find which seasons this player already has in the stats
-            player_stats = existing_stats[existing_stats['player_id'] == pid]
-            existing_seasons = set(player_stats['season'].unique()) if not player_stats.empty else set()
-            gaps = ALL_SEASONS - existing_seasons
-            if gaps:
-                missing[pid] = gaps
-    
-    return squad_df, existing_stats, missing
+    return squad_df, existing_rows, missing
 
 
 def validate_team_result(
@@ -354,8 +571,13 @@ def validate_team_result(
         issues.append(f"national_team_name mismatch: expected '{national_team_name}', got {team_names_in_stats}")
     
     # 3. Check player coverage
+    # Seasons of every player in the stats (one groupby, not one scan per player)
+    per_player_seasons = final_stats.groupby(
+        final_stats['player_id'].astype(int)
+    )['season'].agg(frozenset)
+    
     squad_player_ids = set(squad_df['player_id'].astype(int).unique())
-    stats_player_ids = set(final_stats['player_id'].astype(int).unique())
+    stats_player_ids = set(per_player_seasons.index)
     
     missing_players = squad_player_ids - stats_player_ids
     if missing_players:
@@ -365,14 +587,13 @@ def validate_team_result(
     
     # 4. Check season coverage per player
     players_with_gaps = []
-    for pid in stats_player_ids:
-        player_seasons = set(final_stats[final_stats['player_id'] == pid]['season'].unique())
+    for pid, player_seasons in per_player_seasons.items():
         # Not all players will have all 22 seasons (young players didn't exist in 2004)
         # But they should have data for seasons they were active
         # The main check: no 2015-2021 gap pattern
         has_pre_2015 = any(s < 2015 for s in player_seasons)
         has_post_2021 = any(s > 2021 for s in player_seasons)
-        gap_seasons = {s for s in range(2015, 2022)} - player_seasons
+        gap_seasons = GAP_CHECK_SEASONS - player_seasons
         
         if has_pre_2015 and has_post_2021 and gap_seasons:
             players_with_gaps.append((pid, gap_seasons))
@@ -385,10 +606,10 @@ def validate_team_result(
     # 5. Check for duplicates (same player + season + league + team should be unique)
     # Note: A player CAN have 2 entries for the same league+season with DIFFERENT teams
     # (mid-season transfer). That's legitimate data.
-    dup_check = final_stats.groupby(['player_id', 'season', 'league_id', 'team_id']).size()
-    duplicates = dup_check[dup_check > 1]
-    if len(duplicates) > 0:
-        issues.append(f"❌ {len(duplicates)} duplicate player-season-league-team rows found!")
+    # Rows with a missing key are skipped, as a groupby on the keys would
+    num_duplicates = final_stats.dropna(subset=STATS_KEY_COLUMNS).duplicated(subset=STATS_KEY_COLUMNS).sum()
+    if num_duplicates > 0:
+        issues.append(f"❌ {num_duplicates} duplicate player-season-league-team rows found!")
     
     # 6. Check column count
     if len(final_stats.columns) != 57:
@@ -415,7 +636,7 @@ def repair_team(
     print(f"{'='*70}")
     
     # Analyze gaps
-    squad_df, existing_stats, missing = analyze_team_gaps(
+    squad_df, existing_rows, missing = analyze_team_gaps(
         team_key, national_team_id, national_team_name
     )
     
@@ -428,7 +649,7 @@ def repair_team(
     total_missing_seasons = sum(len(s) for s in missing.values())
     
     print(f"  📊 Squad size: {squad_count}")
-    print(f"  📊 Existing stats rows: {len(existing_stats)}")
+    print(f"  📊 Existing stats rows: {existing_rows}")
     print(f"  📊 Players needing repair: {players_needing_repair}/{squad_count}")
     print(f"  📊 Total missing player-seasons: {total_missing_seasons}")
     
@@ -440,54 +661,111 @@ def repair_team(
         print(f"  [DRY RUN] Would make {total_missing_seasons} API calls")
         return True, 0
     
-    # Scrape missing data
-    new_rows = []
+    # Scrape missing data into one list per column (the national team
+    # columns are constant for the team and added once on the frame).
+    # Each fetched chunk is appended to a partial CSV next to the stats file
+    # before its player-seasons are marked scraped, so an interrupted run
+    # keeps every row it fetched and the next run merges them.
+    stats_path = get_stats_file_for_team(team_key)
+    partial_path = f"{stats_path}.partial"
+    new_columns = {col: [] for col in STATS_COLUMNS if not col.startswith('national_team_')}
+    num_new_rows = 0
     api_calls = 0
     
     # Build player name lookup from squad
-    player_names = {
-        int(row['player_id']): row['player_name'] 
-        for _, row in squad_df.iterrows()
-    }
-    
-    for pid, missing_seasons in tqdm(
-        missing.items(), 
-        desc=f"  Players ({national_team_name})", 
-        total=len(missing)
-    ):
-        player_name = player_names.get(pid, f"ID:{pid}")
-        sorted_seasons = sorted(missing_seasons, reverse=True)  # Recent first
-        
-        # Check which seasons we already scraped in a previous interrupted run
+    player_names = dict(zip(
+        squad_df['player_id'].astype(int).tolist(),
+        squad_df['player_name'].tolist(),
+    ))
+    
+    # Every (player, season) still to fetch — seasons we already scraped in a
+    # previous interrupted run are skipped
+    tasks = []
+    for pid, missing_seasons in missing.items():
         already_scraped = progress.get_player_scraped_seasons(pid)
-        seasons_to_scrape = [s for s in sorted_seasons if s not in already_scraped]
-        
-        if not seasons_to_scrape:
-            continue
-        
-        for season in seasons_to_scrape:
-            rows = scrape_player_season(pid, season)
-            api_calls += 1
-            progress.add_api_calls(1)
-            progress.mark_player_season_scraped(pid, season)
+        for season in sorted(missing_seasons, reverse=True):  # Recent first
+            if season not in already_scraped:
+                tasks.append((pid, season))
+    
+    # Fetch a chunk of player-seasons concurrently (the key manager enforces
+    # the rate limits), then parse and record progress here in the main thread
+    with tqdm(total=len(tasks), desc=f"  Player-seasons ({national_team_name})") as pbar:
+        for start in range(0, len(tasks), REPAIR_BATCH_SIZE):
+            chunk = tasks[start:start + REPAIR_BATCH_SIZE]
+            responses = api_client.batch(
+                [("players", {"id": pid, "season": season}) for pid, season in chunk],
+                return_exceptions=True,
+            )
+            
+            scraped = []
+            for (pid, season), response in zip(chunk, responses):
+                api_calls += 1
+                progress.add_api_calls(1)
+                
+                # A failed request (including RateLimitExhausted once the
+                # client's rate-limit retries run out) is not marked as
+                # scraped, so the next run fetches it again
+                if isinstance(response, Exception):
+                    player_name = player_names.get(pid, f"ID:{pid}")
+                    print(f"    ⚠️ API error for {player_name} ({pid}) season {season}: {response}")
+                    continue
+                
+                buffered = len(new_columns['season'])
+                try:
+                    rows = parse_player_season(
+                        pid, season, response.get("response", []), new_columns
+                    )
+                except Exception as e:
+                    print(f"    ⚠️ Parse error for player {pid} season {season}: {e}")
+                    # Drop any rows of this player-season appended before the error
+                    for values in new_columns.values():
+                        del values[buffered:]
+                    rows = 0
+                
+                num_new_rows += rows
+                scraped.append((pid, season))
+            
+            if new_columns['season']:
+                pd.DataFrame(new_columns).to_csv(
+                    partial_path, mode='a', index=False,
+                    header=not os.path.exists(partial_path),
+                )
+                for values in new_columns.values():
+                    values.clear()
             
-            for row in rows:
-                row['national_team_id'] = national_team_id
-                row['national_team_name'] = national_team_name
-                new_rows.append(row)
+            for pid, season in scraped:
+                progress.mark_player_season_scraped(pid, season)
             
-            # Save progress periodically (every 50 API calls)
-            if api_calls % 50 == 0:
-                progress.save()
+            # Checkpoint progress (throttled to one every few seconds)
+            progress.set_rate_stats(api_client.key_manager.get_rate_stats())
+            progress.save()
+            
+            pbar.update(len(chunk))
     
-    progress.save()
+    progress.set_rate_stats(api_client.key_manager.get_rate_stats())
+    progress.save(force=True)
     
     print(f"\n  📡 API calls made: {api_calls}")
-    print(f"  📡 New stat rows fetched: {len(new_rows)}")
+    print(f"  📡 New stat rows fetched: {num_new_rows}")
+    
+    # Gap analysis only loaded the seasons index; the merge and validation
+    # need the full stats
+    if existing_rows:
+        existing_stats = read_csv_cached(get_stats_file_for_team(team_key))
+    else:
+        existing_stats = pd.DataFrame()
     
-    # Merge new data with existing
-    if new_rows:
-        new_df = pd.DataFrame(new_rows)
+    # Merge new data (this run's and any left by an interrupted one) with existing
+    if os.path.exists(partial_path):
+        new_df = pd.read_csv(partial_path)
+        # An all-empty column would be read as float and turn the matching
+        # integer column of the existing stats into floats on concat
+        empty_columns = new_df.columns[new_df.isna().all()]
+        new_df[empty_columns] = new_df[empty_columns].astype(object)
+        for col in ('height', 'weight'):
+            new_df[col] = parse_height_weight(new_df[col])
+        new_df['national_team_id'] = national_team_id
+        new_df['national_team_name'] = national_team_name
         
         if not existing_stats.empty:
             # Combine existing + new
@@ -498,7 +776,7 @@ def repair_team(
         # Deduplicate: same player + season + league_id + team_id should be unique
         before_dedup = len(combined)
         combined = combined.drop_duplicates(
-            subset=['player_id', 'season', 'league_id', 'team_id'], 
+            subset=STATS_KEY_COLUMNS,
             keep='last'  # Keep the newer data
         )
         after_dedup = len(combined)
@@ -508,8 +786,9 @@ def repair_team(
         # Sort for consistent output
         combined = combined.sort_values(
             ['player_id', 'season', 'league_id'], 
-            ascending=[True, False, True]
-        ).reset_index(drop=True)
+            ascending=[True, False, True],
+            ignore_index=True,
+        )
     else:
         combined = existing_stats
     
@@ -527,37 +806,25 @@ def repair_team(
     else:
         print(f"  ⚠️ Validation has critical issues (see above)")
     
-    # Save regardless (even with warnings — the data is real, just may have expected gaps)
-    stats_path = get_stats_file_for_team(team_key)
-    
-    # Ensure correct column order (match existing files exactly)
-    expected_columns = [
-        'player_id', 'player_name', 'firstname', 'lastname', 'nationality',
-        'birth_date', 'birth_place', 'birth_country', 'age', 'height', 'weight',
-        'injured', 'photo', 'season', 'team_id', 'team_name', 'league_id',
-        'league_name', 'league_country', 'position', 'appearances', 'lineups',
-        'minutes', 'rating', 'captain', 'substitutes_in', 'substitutes_out',
-        'substitutes_bench', 'shots_total', 'shots_on_target', 'goals',
-        'goals_conceded', 'assists', 'saves', 'passes_total', 'passes_key',
-        'passes_accuracy', 'tackles_total', 'tackles_blocks',
-        'tackles_interceptions', 'duels_total', 'duels_won', 'dribbles_attempts',
-        'dribbles_success', 'dribbles_past', 'fouls_drawn', 'fouls_committed',
-        'cards_yellow', 'cards_yellowred', 'cards_red', 'penalty_won',
-        'penalty_committed', 'penalty_scored', 'penalty_missed', 'penalty_saved',
-        'national_team_id', 'national_team_name'
-    ]
+    # Save regardless (even with warnings — the data is real, just may have expected gaps),
+    # in the exact column order of the existing files
     
     # Add any missing columns with NaN
-    for col in expected_columns:
+    for col in STATS_COLUMNS:
         if col not in combined.columns:
             combined[col] = None
     
     # Reorder to match
-    combined = combined[expected_columns]
+    combined = combined[STATS_COLUMNS]
     
+    # The Parquet cache is rebuilt from this CSV on its next read
     combined.to_csv(stats_path, index=False)
     print(f"  💾 Saved {len(combined)} rows to {stats_path}")
     
+    # The fetched rows are in the stats file now
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+    
     return True, api_calls
 
 
@@ -567,36 +834,56 @@ def rebuild_all_player_statistics():
     print("📦 Rebuilding all_player_statistics.csv from individual team files...")
     print(f"{'='*70}")
     
-    all_dfs = []
-    
-    for team_key, (national_team_id, national_team_name) in sorted(TEAM_REGISTRY.items()):
+    def load_team_stats(team_key: str) -> Optional[pd.DataFrame]:
         stats_path = get_stats_file_for_team(team_key)
-        if os.path.exists(stats_path):
-            df = pd.read_csv(stats_path)
+        if not os.path.exists(stats_path):
+            return None
+        df = read_csv_cached(stats_path)
+        # Go through 'string' first: an all-empty column is read as float64,
+        # and float categories can't be unioned with the other files' strings
+        df = df.astype({col: 'string' for col in CATEGORY_COLUMNS})
+        return df.astype({col: 'category' for col in CATEGORY_COLUMNS})
+    
+    # Load the team files in parallel (the Parquet/CSV readers release the
+    # GIL), then report them in order
+    teams = sorted(TEAM_REGISTRY.items())
+    with ThreadPoolExecutor(max_workers=REBUILD_READ_WORKERS) as executor:
+        team_dfs = list(executor.map(load_team_stats, [team_key for team_key, _ in teams]))
+    
+    all_dfs = []
+    for (team_key, (national_team_id, national_team_name)), df in zip(teams, team_dfs):
+        if df is not None:
             all_dfs.append(df)
             print(f"  ✅ {national_team_name}: {len(df)} rows")
         else:
             print(f"  ❌ Missing stats file for {national_team_name}")
     
     if all_dfs:
+        # Give every file's categoricals the same (sorted) categories so
+        # concat keeps them categorical and sorting stays alphabetical
+        for col in CATEGORY_COLUMNS:
+            categories = union_categoricals(
+                [df[col] for df in all_dfs], sort_categories=True
+            ).categories
+            for df in all_dfs:
+                df[col] = df[col].cat.set_categories(categories)
+        
         combined = pd.concat(all_dfs, ignore_index=True)
         
         # Deduplicate across teams (a player might be in multiple national team squads... unlikely but possible)
         # Actually, each player belongs to ONE national team, but their club stats are per team
         # The dedup key should be player_id + season + league_id + team_id  
         before = len(combined)
-        combined = combined.drop_duplicates(
-            subset=['player_id', 'season', 'league_id', 'team_id'],
-            keep='first'
-        )
+        combined = combined.drop_duplicates(subset=STATS_KEY_COLUMNS, keep='first')
         after = len(combined)
         if before != after:
             print(f"\n  🔄 Cross-team dedup: {before} → {after} ({before - after} duplicates)")
         
         combined = combined.sort_values(
             ['national_team_name', 'player_id', 'season', 'league_id'],
-            ascending=[True, True, False, True]
-        ).reset_index(drop=True)
+            ascending=[True, True, False, True],
+            ignore_index=True,
+        )
         
         output_path = f"{STATISTICS_OUTPUT_DIR}/all_player_statistics.csv"
         combined.to_csv(output_path, index=False)
@@ -626,6 +913,7 @@ def main():
     parser.add_argument('--team', type=str, help='Repair only a specific team (e.g., portugal)')
     parser.add_argument('--rebuild-only', action='store_true', help='Only rebuild all_player_statistics.csv')
     parser.add_argument('--resume', action='store_true', default=True, help='Resume from previous run')
+    parser.add_argument('--workers', type=int, default=REPAIR_TEAM_WORKERS, help='Teams to repair concurrently')
     args = parser.parse_args()
     
     print("=" * 70)
@@ -654,30 +942,46 @@ def main():
     else:
         teams_to_process = TEAM_REGISTRY
     
-    # Process each team
+    # Process each team (several at once; they only share the progress
+    # tracker and the API client's rate limits)
     total_api_calls = 0
     results = {}
     
-    for team_key, (national_team_id, national_team_name) in sorted(teams_to_process.items()):
-        # Skip completed teams if resuming
-        if args.resume and progress.is_team_completed(team_key):
-            print(f"\n  ⏭️ Skipping {national_team_name} (already completed)")
-            results[team_key] = ("skipped", 0)
-            continue
-        
-        success, api_calls = repair_team(
-            team_key, national_team_id, national_team_name,
-            progress, dry_run=args.dry_run
-        )
-        
-        total_api_calls += api_calls
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {}
+        for team_key, (national_team_id, national_team_name) in sorted(teams_to_process.items()):
+            # Skip completed teams if resuming
+            if args.resume and progress.is_team_completed(team_key):
+                print(f"\n  ⏭️ Skipping {national_team_name} (already completed)")
+                results[team_key] = ("skipped", 0)
+                continue
+            
+            future = executor.submit(
+                repair_team,
+                team_key, national_team_id, national_team_name,
+                progress, dry_run=args.dry_run
+            )
+            futures[future] = team_key
         
-        if success:
-            if not args.dry_run:
-                progress.mark_team_completed(team_key)
-            results[team_key] = ("success", api_calls)
-        else:
-            results[team_key] = ("failed", api_calls)
+        for future in as_completed(futures):
+            team_key = futures[future]
+            # One team's error must not stop the others from being marked
+            # completed, nor skip the rebuild and summary below
+            try:
+                success, api_calls = future.result()
+            except Exception as e:
+                print(f"\n  ❌ Error repairing {team_key}: {e}")
+                results[team_key] = ("failed", 0)
+                continue
+            
+            total_api_calls += api_calls
+            
+            if success:
+                if not args.dry_run:
+                    progress.mark_team_completed(team_key)
+                results[team_key] = ("success", api_calls)
+            else:
+                results[team_key] = ("failed", api_calls)
     
     # Rebuild the combined file
     if not args.dry_run:
@@ -701,7 +1005,7 @@ def main():
     
     if failed > 0:
         print(f"\n  ❌ Failed teams:")
-        for team_key, (status, _) in results.items():
+        for team_key, (status, _) in sorted(results.items()):
             if status == "failed":
                 print(f"     - {team_key}")
 
@@ -11,6 +11,9 @@ import os
 import sys
 import json
 import time
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
@@ -21,7 +24,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from api_client import api_client
-from scraper import WorldCup2026Scraper
+from scraper import WorldCup2026Scraper, ScrapeStopped
+from utils import CombinedCSVWriter, WriteAheadLog
 from config import (
     SEASONS_TO_SCRAPE,
     OUTPUT_DIR,
@@ -32,20 +36,35 @@ from config import (
 
 # Progress tracking file
 PROGRESS_FILE = f"{OUTPUT_DIR}/scrape_progress.json"
+PROGRESS_EVENTS_FILE = f"{OUTPUT_DIR}/scrape_progress.wal.jsonl"
+
+# Columns of the teams list the scraper uses
+TEAM_COLUMNS = ["team_id", "team_name"]
+TEAM_DTYPES = {"team_id": "Int32", "team_name": "string"}
 
 # Error thresholds
 MAX_CONSECUTIVE_ERRORS = 5
 MAX_EMPTY_RESPONSES = 10
 MIN_PLAYERS_PER_TEAM = 10  # Warn if team has fewer players
 
+# Refresh the locally tracked quota usage from the server this often
+QUOTA_SYNC_INTERVAL_SECONDS = 300
+QUOTA_SYNC_REQUESTS = 200
+
+# Default number of teams fetched concurrently. Bounded so memory stays at
+# a few teams' data and the connection pool isn't outgrown; all requests
+# share the API client's key manager, so the per-key rate limits still hold
+TEAM_WORKERS = 4
+
 
 class DataValidator:
     """Validates scraped data quality on-the-fly."""
     
-    REQUIRED_STAT_COLUMNS = [
+    REQUIRED_STAT_COLUMNS = frozenset([
         'player_id', 'player_name', 'season', 'team_id', 'team_name',
         'appearances', 'minutes', 'goals'
-    ]
+    ])
+    REQUIRED_SQUAD_COLUMNS = frozenset(['player_id', 'player_name', 'position'])
     
     @staticmethod
     def validate_squad(df: pd.DataFrame, team_name: str) -> Tuple[bool, str]:
@@ -57,8 +76,7 @@ class DataValidator:
             return True, f"⚠️ Warning: {team_name} has only {len(df)} players (expected >={MIN_PLAYERS_PER_TEAM})"
         
         # Check for required columns
-        required = ['player_id', 'player_name', 'position']
-        missing = [col for col in required if col not in df.columns]
+        missing = sorted(DataValidator.REQUIRED_SQUAD_COLUMNS.difference(df.columns))
         if missing:
             return False, f"Missing columns in squad: {missing}"
         
@@ -76,7 +94,7 @@ class DataValidator:
             return False, f"Empty statistics for {team_name}"
         
         # Check for required columns
-        missing = [col for col in DataValidator.REQUIRED_STAT_COLUMNS if col not in df.columns]
+        missing = sorted(DataValidator.REQUIRED_STAT_COLUMNS.difference(df.columns))
         if missing:
             return False, f"Missing statistics columns: {missing}"
         
@@ -84,8 +102,9 @@ class DataValidator:
         players_with_data = df['player_id'].nunique()
         coverage = (players_with_data / expected_players) * 100 if expected_players > 0 else 0
         
-        # Count records with actual appearances
-        records_with_apps = len(df[df['appearances'] > 0])
+        # Count records with actual appearances (summing the mask avoids
+        # materializing the filtered frame)
+        records_with_apps = int((df['appearances'] > 0).sum())
         
         if coverage < 50:
             return True, f"⚠️ Low coverage: {players_with_data}/{expected_players} players ({coverage:.1f}%)"
@@ -94,11 +113,33 @@ class DataValidator:
 
 
 class ProgressTracker:
-    """Tracks scraping progress for resume capability."""
+    """
+    Tracks scraping progress for resume capability.
+    
+    Completed/failed teams and errors are appended as events to a log next
+    to the progress file instead of rewriting the whole JSON for each one.
+    The log is replayed on load and compacted into the JSON by save().
     
-    def __init__(self, progress_file: str = PROGRESS_FILE):
+    Events are flushed as they are logged rather than debounced: a team
+    takes minutes to scrape, so losing its completion event to a crash
+    would cost far more quota than the flush saves.
+    """
+    
+    # Event type -> (progress list it goes into, timestamp field)
+    EVENT_LISTS = {
+        "completed": ("completed_teams", "completed_at"),
+        "failed": ("failed_teams", "failed_at"),
+        "error": ("errors", "timestamp"),
+    }
+    
+    def __init__(self, progress_file: str = PROGRESS_FILE, events_file: str = PROGRESS_EVENTS_FILE):
         self.progress_file = progress_file
+        self.events = WriteAheadLog(events_file)
         self.progress = self._load_progress()
+        self._replay_events()
+        # Membership is checked through a set; the JSON keeps the list
+        self.completed_ids = {t["team_id"] for t in self.progress["completed_teams"]}
+        atexit.register(self.close)
     
     def _load_progress(self) -> Dict:
         """Load existing progress or create new."""
@@ -114,43 +155,63 @@ class ProgressTracker:
             "errors": [],
         }
     
+    def _replay_events(self):
+        """Apply logged events that are newer than the progress JSON."""
+        saved_at = self.progress["last_updated"] or ""
+        for entry in self.events.entries():
+            list_name, time_field = self.EVENT_LISTS[entry.pop("event")]
+            # Older events were already compacted into the JSON
+            if entry[time_field] > saved_at:
+                self.progress[list_name].append(entry)
+    
+    def _log_event(self, event: str, entry: Dict):
+        """Record an event in memory and append it to the log."""
+        list_name, _ = self.EVENT_LISTS[event]
+        self.progress[list_name].append(entry)
+        self.events.append({"event": event, **entry})
+    
     def save(self):
-        """Save current progress."""
+        """Save current progress as a full JSON snapshot and clear the event log."""
         self.progress["last_updated"] = datetime.now().isoformat()
-        with open(self.progress_file, 'w') as f:
+        tmp_file = f"{self.progress_file}.tmp"
+        with open(tmp_file, 'w') as f:
             json.dump(self.progress, f, indent=2)
+        os.replace(tmp_file, self.progress_file)
+        self.events.clear()
+    
+    def close(self):
+        """Close the event log; logged events stay in it until the next save()."""
+        self.events.close()
     
     def mark_team_completed(self, team_id: int, team_name: str, stats_count: int):
         """Mark a team as completed."""
-        self.progress["completed_teams"].append({
+        self.completed_ids.add(team_id)
+        self._log_event("completed", {
             "team_id": team_id,
             "team_name": team_name,
             "stats_count": stats_count,
             "completed_at": datetime.now().isoformat()
         })
-        self.save()
     
     def mark_team_failed(self, team_id: int, team_name: str, reason: str):
         """Mark a team as failed."""
-        self.progress["failed_teams"].append({
+        self._log_event("failed", {
             "team_id": team_id,
             "team_name": team_name,
             "reason": reason,
             "failed_at": datetime.now().isoformat()
         })
-        self.save()
     
     def add_error(self, error: str):
         """Log an error."""
-        self.progress["errors"].append({
+        self._log_event("error", {
             "error": error,
             "timestamp": datetime.now().isoformat()
         })
-        self.save()
     
     def is_team_completed(self, team_id: int) -> bool:
         """Check if a team has already been scraped."""
-        return any(t["team_id"] == team_id for t in self.progress["completed_teams"])
+        return team_id in self.completed_ids
     
     def get_summary(self) -> str:
         """Get progress summary."""
@@ -161,48 +222,221 @@ class ProgressTracker:
 
 
 class QuotaMonitor:
-    """Monitors API quota usage."""
+    """
+    Monitors API quota usage.
     
-    def __init__(self, daily_limit: int = 7500):
+    The account status is only fetched from the server every
+    QUOTA_SYNC_INTERVAL_SECONDS or QUOTA_SYNC_REQUESTS requests; in between,
+    usage is estimated from the requests the API client has made since the
+    last sync. The last sync is kept in the progress file so a resumed run
+    doesn't have to re-query on startup.
+    """
+    
+    def __init__(self, daily_limit: int = 7500, progress: Optional[ProgressTracker] = None):
         self.daily_limit = daily_limit
         self.requests_made = 0
         self.start_time = time.time()
+        self.progress = progress
+        
+        # Server-reported usage at the last sync, and the client's request
+        # count at that moment
+        self.last_sync = 0.0
+        self.used_at_sync = 0
+        self.limit = daily_limit
+        self.requests_at_sync = 0
+        
+        saved = progress.progress.get("quota") if progress else None
+        if saved and time.time() - saved["synced_at"] < QUOTA_SYNC_INTERVAL_SECONDS:
+            self.last_sync = saved["synced_at"]
+            self.used_at_sync = saved["used"]
+            self.limit = saved["limit"]
+    
+    def _sync(self) -> bool:
+        """Fetch the account status from the server. Returns False if it failed."""
+        status = api_client.get_account_status()
+        response = status.get("response", {})
+        if not response:
+            return False
+        requests_info = response.get("requests", {})
+        
+        self.used_at_sync = requests_info.get("current", 0)
+        self.limit = requests_info.get("limit_day", self.daily_limit)
+        self.requests_at_sync = api_client.total_requests
+        self.last_sync = time.time()
+        return True
     
-    def check_quota(self) -> Tuple[bool, int, int]:
+    def check_quota(self) -> Tuple[bool, Optional[int], Optional[int]]:
         """
         Check API quota status.
-        Returns: (is_ok, remaining, used)
+        
+        If the server can't be reached, usage is still estimated from the
+        last successful sync (or, before any sync, from the quota headers of
+        recent responses). With no estimate at all the quota is reported as
+        not OK, so no further requests are started blind.
+        
+        Returns: (is_ok, remaining, used); remaining and used are None if unknown
         """
-        try:
-            status = api_client.get_account_status()
-            response = status.get("response", {})
-            requests_info = response.get("requests", {})
-            
-            current = requests_info.get("current", 0)
-            limit = requests_info.get("limit_day", self.daily_limit)
-            remaining = limit - current
-            
-            return remaining > 100, remaining, current  # Leave buffer of 100 requests
-        except Exception as e:
-            print(f"  ⚠️ Could not check quota: {e}")
-            return True, -1, -1
+        since_sync = api_client.total_requests - self.requests_at_sync
+        if (time.time() - self.last_sync >= QUOTA_SYNC_INTERVAL_SECONDS
+                or since_sync >= QUOTA_SYNC_REQUESTS):
+            try:
+                synced = self._sync()
+            except Exception as e:
+                print(f"  ⚠️ Could not check quota: {e}")
+                synced = False
+            if synced:
+                since_sync = 0
+            elif self.last_sync:
+                print("  ⚠️ Could not sync API quota; estimating from the last sync")
+        
+        self.requests_made = api_client.total_requests
+        if self.last_sync:
+            current = self.used_at_sync + since_sync
+            remaining = self.limit - current
+            if self.progress:
+                self.progress.progress["quota"] = {
+                    "synced_at": self.last_sync,
+                    "used": current,
+                    "limit": self.limit,
+                }
+        else:
+            remaining = api_client.get_daily_remaining()
+            if remaining is None:
+                return False, None, None
+            current = self.limit - remaining
+        
+        return remaining > 100, remaining, current  # Leave buffer of 100 requests
     
     def print_status(self):
         """Print current quota status."""
         is_ok, remaining, used = self.check_quota()
-        if remaining >= 0:
+        if remaining is None:
+            print("\n📊 API Quota: unknown (the account status could not be fetched)")
+        else:
             print(f"\n📊 API Quota: {used}/{self.daily_limit} used, {remaining} remaining")
             if not is_ok:
                 print("  ⚠️ WARNING: Running low on API quota!")
         return is_ok
 
 
-def scrape_all_teams(resume: bool = True):
+# String columns whose distinct values are at most this share of the rows
+# are stored as categoricals while a team is held in memory
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def compress_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a team's DataFrame in place: repeated strings become categoricals
+    and integer columns are downcast to the smallest type that fits.
+    Float columns are left alone so the values written to CSV don't change.
+    
+    Args:
+        df: Squad or statistics DataFrame
+    
+    Returns:
+        The same DataFrame
+    """
+    if df.empty:
+        return df
+    
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        if df[col].nunique() / len(df) <= CATEGORY_MAX_UNIQUE_RATIO:
+            df[col] = df[col].astype("category")
+    
+    for col in df.select_dtypes(include=["integer"]).columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    
+    return df
+
+
+def scrape_team(
+    scraper: WorldCup2026Scraper,
+    team_id: int,
+    team_name: str,
+    stop: Optional[threading.Event] = None,
+) -> Tuple[pd.DataFrame, Optional[pd.DataFrame], str]:
+    """
+    Fetch a team's squad and, if it is valid, its players' statistics.
+    Safe to run in a worker thread; nothing here touches progress tracking.
+    
+    Args:
+        scraper: Scraper used for the API calls
+        team_id: Team ID
+        team_name: Team name
+        stop: If given and set, the team is abandoned before its next player
+    
+    Returns:
+        (squad_df, stats_df, squad validation message); stats_df is None
+        if the squad failed validation
+    
+    Raises:
+        ScrapeStopped: If `stop` was set before the team finished
+    """
+    print(f"\n👥 Fetching squad for {team_name}...")
+    squad_df = compress_frame(scraper.scrape_team_squad(team_id, team_name))
+    
+    is_valid, message = DataValidator.validate_squad(squad_df, team_name)
+    if not is_valid:
+        return squad_df, None, message
+    
+    if stop is not None and stop.is_set():
+        raise ScrapeStopped(f"Stopped before fetching statistics for {team_name}")
+    
+    print(f"\n📊 Fetching player statistics for {team_name} ({len(squad_df)} players × {len(SEASONS_TO_SCRAPE)} seasons)...")
+    stats_df = compress_frame(scraper.scrape_all_team_players_statistics(team_id, team_name, squad_df, stop))
+    return squad_df, stats_df, message
+
+
+def scrape_single_team(team_id: int, team_name: str):
+    """
+    Scrape one team with the same validation and progress tracking as a
+    full run. The team's files are written by the scraper; the combined
+    files are left alone.
+    
+    Args:
+        team_id: Team ID
+        team_name: Team name
+    """
+    print("=" * 70)
+    print(f"🏆 FULL SCRAPE FOR {team_name.upper()} (Team ID: {team_id})")
+    print("=" * 70)
+    
+    progress = ProgressTracker()
+    quota = QuotaMonitor(progress=progress)
+    if not quota.print_status():
+        print("\n❌ Insufficient API quota. Aborting.")
+        return
+    
+    try:
+        squad_df, stats_df, message = scrape_team(WorldCup2026Scraper(), team_id, team_name)
+        print(f"\n   {team_name} squad: {message}")
+        
+        if stats_df is None:
+            progress.mark_team_failed(team_id, team_name, message)
+            return
+        
+        is_valid, message = DataValidator.validate_statistics(stats_df, team_name, len(squad_df))
+        print(f"   {message}")
+        
+        progress.mark_team_completed(team_id, team_name, len(stats_df))
+        print(f"\n✅ {team_name} completed: {len(squad_df)} players, {len(stats_df)} stat records")
+    except Exception as e:
+        error_msg = f"Error processing {team_name}: {str(e)}"
+        print(f"\n❌ {error_msg}")
+        progress.add_error(error_msg)
+        progress.mark_team_failed(team_id, team_name, str(e))
+    finally:
+        progress.save()
+
+
+def scrape_all_teams(resume: bool = True, write_parquet: bool = True, workers: int = TEAM_WORKERS):
     """
     Scrape all World Cup 2026 teams with validation and error handling.
     
     Args:
         resume: If True, skip already-completed teams
+        write_parquet: If True, also write Parquet copies of the combined files
+        workers: Maximum number of teams in flight at once
     """
     print("=" * 70)
     print("🏆 WORLD CUP 2026 - FULL TEAM SCRAPER (PRODUCTION)")
@@ -214,7 +448,7 @@ def scrape_all_teams(resume: bool = True):
     scraper = WorldCup2026Scraper()
     validator = DataValidator()
     progress = ProgressTracker()
-    quota = QuotaMonitor()
+    quota = QuotaMonitor(progress=progress)
     
     # Start progress tracking
     if not progress.progress["started_at"]:
@@ -231,7 +465,8 @@ def scrape_all_teams(resume: bool = True):
     
     if os.path.exists(teams_file):
         print(f"\n📋 Loading existing teams from {teams_file}")
-        teams_df = pd.read_csv(teams_file)
+        # Only the id and name are used
+        teams_df = pd.read_csv(teams_file, usecols=TEAM_COLUMNS, dtype=TEAM_DTYPES)
     else:
         print("\n📋 Fetching World Cup 2026 teams...")
         teams_df = scraper.scrape_world_cup_teams()
@@ -240,12 +475,12 @@ def scrape_all_teams(resume: bool = True):
         print("❌ No teams found. Aborting.")
         return
     
+    teams_df = teams_df[TEAM_COLUMNS].astype(TEAM_DTYPES).dropna(subset=["team_id"])
     print(f"   Found {len(teams_df)} teams total")
     
     # Filter out already completed teams if resuming
     if resume:
-        completed_ids = [t["team_id"] for t in progress.progress["completed_teams"]]
-        remaining_teams = teams_df[~teams_df["team_id"].isin(completed_ids)]
+        remaining_teams = teams_df[~teams_df["team_id"].isin(progress.completed_ids)]
         skipped = len(teams_df) - len(remaining_teams)
         if skipped > 0:
             print(f"   ⏭️ Skipping {skipped} already-completed teams")
@@ -258,119 +493,162 @@ def scrape_all_teams(resume: bool = True):
     consecutive_errors = 0
     empty_responses = 0
     
-    # Step 2: Process each team
-    all_squads = []
-    all_statistics = []
+    # Step 2: Process teams, several at a time. Workers only fetch and
+    # validate; progress, error counting and pausing stay in this thread and
+    # happen as each team finishes.
+    squads_writer = CombinedCSVWriter(f"{PLAYERS_OUTPUT_DIR}/all_squads.csv", write_parquet)
+    stats_writer = CombinedCSVWriter(f"{STATISTICS_OUTPUT_DIR}/all_player_statistics.csv", write_parquet)
+    # Appends to the combined files run on one background thread (keeping
+    # their order), so this thread goes straight back to starting teams
+    write_executor = ThreadPoolExecutor(max_workers=1)
+    writes = []
+    
+    teams = list(zip(
+        teams_df.index,
+        teams_df["team_id"].astype(int).tolist(),
+        teams_df["team_name"].tolist(),
+    ))
+    next_team = 0
+    pending = {}
+    quota_paused = False
+    
+    workers = max(1, workers)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    # Set when the run is cut short; in-flight teams stop before their next
+    # player instead of spending quota on results nobody will collect
+    stop = threading.Event()
+    
+    def stop_in_flight():
+        """Abandon the teams in flight (recorded as failed) and save progress."""
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        for team_id, team_name in pending.values():
+            progress.mark_team_failed(team_id, team_name, "Stopped before finishing")
+        progress.save()
     
-    for idx, team in teams_df.iterrows():
-        team_id = team["team_id"]
-        team_name = team["team_name"]
-        
-        if pd.isna(team_id):
-            continue
-        
-        team_id = int(team_id)
-        
-        print(f"\n{'='*60}")
-        print(f"📌 [{idx+1}/{len(teams_df)}] Processing: {team_name} (ID: {team_id})")
-        print(f"{'='*60}")
-        
-        try:
-            # Check quota before each team
-            if idx % 5 == 0:  # Check every 5 teams
-                is_ok, remaining, _ = quota.check_quota()
-                if not is_ok:
-                    print(f"\n⚠️ API quota low ({remaining} remaining). Pausing...")
-                    print("   Re-run the script tomorrow to continue.")
-                    progress.save()
-                    return
-            
-            # Step 2a: Get squad
-            print(f"\n👥 Fetching squad...")
-            squad_df = scraper.scrape_team_squad(team_id, team_name)
-            
-            # Validate squad
-            is_valid, message = validator.validate_squad(squad_df, team_name)
-            print(f"   {message}")
-            
-            if not is_valid:
-                consecutive_errors += 1
-                empty_responses += 1
-                progress.mark_team_failed(team_id, team_name, message)
+    try:
+        while next_team < len(teams) or pending:
+            # Keep up to `workers` teams in flight
+            while next_team < len(teams) and len(pending) < workers:
+                idx, team_id, team_name = teams[next_team]
+                next_team += 1
                 
-                if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
-                    print(f"\n❌ {MAX_CONSECUTIVE_ERRORS} consecutive errors. PAUSING to avoid wasting API quota.")
-                    print("   Please check the errors and re-run when ready.")
-                    progress.save()
-                    sys.exit(1)
-                continue
-            
-            all_squads.append(squad_df)
-            
-            # Step 2b: Get player statistics
-            print(f"\n📊 Fetching player statistics ({len(squad_df)} players × {len(SEASONS_TO_SCRAPE)} seasons)...")
-            stats_df = scraper.scrape_all_team_players_statistics(team_id, team_name, squad_df)
-            
-            # Validate statistics
-            is_valid, message = validator.validate_statistics(stats_df, team_name, len(squad_df))
-            print(f"   {message}")
-            
-            if stats_df.empty:
-                empty_responses += 1
-                if empty_responses >= MAX_EMPTY_RESPONSES:
-                    print(f"\n⚠️ {MAX_EMPTY_RESPONSES} empty responses. API may be having issues.")
-                    progress.add_error(f"Too many empty responses after {team_name}")
-            else:
-                all_statistics.append(stats_df)
-                empty_responses = 0  # Reset on success
-            
-            # Mark team as completed
-            progress.mark_team_completed(team_id, team_name, len(stats_df))
-            consecutive_errors = 0  # Reset on success
-            
-            print(f"\n✅ {team_name} completed: {len(squad_df)} players, {len(stats_df)} stat records")
-            
-        except KeyboardInterrupt:
-            print("\n\n⏸️ Interrupted by user. Progress saved.")
-            progress.save()
-            sys.exit(0)
+                # Check quota before starting teams
+                if idx % 5 == 0:  # Check every 5 teams
+                    is_ok, remaining, _ = quota.check_quota()
+                    if not is_ok:
+                        # Stop starting teams, but let the in-flight ones finish
+                        if remaining is None:
+                            print("\n⚠️ API quota unknown. Pausing...")
+                        else:
+                            print(f"\n⚠️ API quota low ({remaining} remaining). Pausing...")
+                        print("   Re-run the script tomorrow to continue.")
+                        quota_paused = True
+                        next_team = len(teams)
+                        break
+                
+                print(f"\n{'='*60}")
+                print(f"📌 [{idx+1}/{len(teams_df)}] Processing: {team_name} (ID: {team_id})")
+                print(f"{'='*60}")
+                pending[executor.submit(scrape_team, scraper, team_id, team_name, stop)] = (team_id, team_name)
             
-        except Exception as e:
-            error_msg = f"Error processing {team_name}: {str(e)}"
-            print(f"\n❌ {error_msg}")
-            progress.add_error(error_msg)
-            progress.mark_team_failed(team_id, team_name, str(e))
-            consecutive_errors += 1
+            if not pending:
+                break
             
-            # Check if error is critical
-            if "rate limit" in str(e).lower() or "quota" in str(e).lower():
-                print("\n⚠️ Rate limit or quota error detected. Waiting 60 seconds...")
-                time.sleep(60)
-                consecutive_errors = 0  # Don't count rate limit as consecutive error
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                team_id, team_name = pending.pop(future)
+                
+                try:
+                    squad_df, stats_df, message = future.result()
+                    print(f"\n   {team_name} squad: {message}")
+                    
+                    if stats_df is None:
+                        consecutive_errors += 1
+                        empty_responses += 1
+                        progress.mark_team_failed(team_id, team_name, message)
+                        
+                        if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                            print(f"\n❌ {MAX_CONSECUTIVE_ERRORS} consecutive errors. PAUSING to avoid wasting API quota.")
+                            print("   Please check the errors and re-run when ready.")
+                            stop_in_flight()
+                            sys.exit(1)
+                        continue
+                    
+                    writes.append(write_executor.submit(squads_writer.append, squad_df))
+                    
+                    # Validate statistics
+                    is_valid, message = validator.validate_statistics(stats_df, team_name, len(squad_df))
+                    print(f"   {message}")
+                    
+                    if stats_df.empty:
+                        empty_responses += 1
+                        if empty_responses >= MAX_EMPTY_RESPONSES:
+                            print(f"\n⚠️ {MAX_EMPTY_RESPONSES} empty responses. API may be having issues.")
+                            progress.add_error(f"Too many empty responses after {team_name}")
+                    else:
+                        writes.append(write_executor.submit(stats_writer.append, stats_df))
+                        empty_responses = 0  # Reset on success
+                    
+                    # Mark team as completed
+                    progress.mark_team_completed(team_id, team_name, len(stats_df))
+                    consecutive_errors = 0  # Reset on success
+                    
+                    print(f"\n✅ {team_name} completed: {len(squad_df)} players, {len(stats_df)} stat records")
+                    
+                except Exception as e:
+                    error_msg = f"Error processing {team_name}: {str(e)}"
+                    print(f"\n❌ {error_msg}")
+                    progress.add_error(error_msg)
+                    progress.mark_team_failed(team_id, team_name, str(e))
+                    consecutive_errors += 1
+                    
+                    # Check if error is critical
+                    if "rate limit" in str(e).lower() or "quota" in str(e).lower():
+                        print("\n⚠️ Rate limit or quota error detected. Waiting 60 seconds...")
+                        time.sleep(60)
+                        consecutive_errors = 0  # Don't count rate limit as consecutive error
+                    
+                    if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                        print(f"\n❌ {MAX_CONSECUTIVE_ERRORS} consecutive errors. PAUSING.")
+                        stop_in_flight()
+                        sys.exit(1)
             
-            if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
-                print(f"\n❌ {MAX_CONSECUTIVE_ERRORS} consecutive errors. PAUSING.")
-                progress.save()
-                sys.exit(1)
+            # Drop the handled teams' frames before waiting on the next
+            # team; the completed futures and loop variables would
+            # otherwise keep them alive alongside the teams in flight
+            done = future = squad_df = stats_df = None
+    
+    except KeyboardInterrupt:
+        print("\n\n⏸️ Interrupted by user. Saving progress...")
+        stop_in_flight()
+        print("   Progress saved.")
+        sys.exit(0)
+    
+    executor.shutdown(wait=True)
+    
+    # Wait for the queued appends, surfacing any write error
+    write_executor.shutdown(wait=True)
+    for write in writes:
+        write.result()
+    
+    if quota_paused:
+        progress.save()
+        return
     
     # Step 3: Save combined data
     print("\n" + "=" * 70)
     print("💾 SAVING COMBINED DATA")
     print("=" * 70)
     
-    if all_squads:
-        combined_squads = pd.concat(all_squads, ignore_index=True)
-        output_path = f"{PLAYERS_OUTPUT_DIR}/all_squads.csv"
-        combined_squads.to_csv(output_path, index=False)
-        print(f"✅ Saved {len(combined_squads)} players to {output_path}")
+    if squads_writer.finish():
+        print(f"✅ Saved {squads_writer.rows} players to {squads_writer.output_path}")
     
-    if all_statistics:
-        combined_stats = pd.concat(all_statistics, ignore_index=True)
-        output_path = f"{STATISTICS_OUTPUT_DIR}/all_player_statistics.csv"
-        combined_stats.to_csv(output_path, index=False)
-        print(f"✅ Saved {len(combined_stats)} statistics to {output_path}")
+    if stats_writer.finish():
+        print(f"✅ Saved {stats_writer.rows} statistics to {stats_writer.output_path}")
     
     # Final summary
+    progress.save()
     print("\n" + "=" * 70)
     print("🏁 SCRAPING COMPLETE")
     print("=" * 70)
@@ -419,16 +697,23 @@ if __name__ == "__main__":
     parser.add_argument("--progress", action="store_true", help="Show current progress")
     parser.add_argument("--no-resume", action="store_true", help="Start fresh, don't skip completed teams")
     parser.add_argument("--reset", action="store_true", help="Reset progress and start fresh")
+    parser.add_argument("--csv-only", action="store_true", help="Don't write Parquet copies of the combined files")
+    parser.add_argument("--workers", type=int, default=TEAM_WORKERS, help="Teams to scrape concurrently")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the API instead of reusing cached responses")
     
     args = parser.parse_args()
     
     if args.progress:
         print_progress()
     elif args.reset:
-        if os.path.exists(PROGRESS_FILE):
-            os.remove(PROGRESS_FILE)
+        progress_files = [path for path in (PROGRESS_FILE, PROGRESS_EVENTS_FILE) if os.path.exists(path)]
+        if progress_files:
+            for path in progress_files:
+                os.remove(path)
             print("✅ Progress reset. Ready for fresh start.")
         else:
             print("No progress file found.")
     else:
-        scrape_all_teams(resume=not args.no_resume)
+        if args.no_cache:
+            api_client.cache.enabled = False
+        scrape_all_teams(resume=not args.no_resume, write_parquet=not args.csv_only, workers=args.workers)
@@ -11,6 +11,7 @@ Features:
 import os
 import sys
 import json
+import atexit
 from datetime import datetime
 from typing import List, Dict, Set
 import pandas as pd
@@ -21,6 +22,8 @@ load_dotenv()
 
 from api_client import api_client
 from scraper import WorldCup2026Scraper
+from utils import WriteAheadLog
+from repair_statistics import STATS_COLUMNS, parse_player_season
 from config import (
     OUTPUT_DIR,
     PLAYERS_OUTPUT_DIR,
@@ -37,16 +40,43 @@ HISTORICAL_SEASONS = SEASONS_TO_SCRAPE  # [2025, 2024, 2023, ..., 2005, 2004]
 # Progress file
 HISTORICAL_PROGRESS_FILE = f"{OUTPUT_DIR}/historical_scrape_progress.json"
 
+# Logged progress events after which the progress JSON is rewritten
+PROGRESS_COMPACT_EVENTS = 500
+
 # Minimum quota to keep as buffer
 MIN_QUOTA_BUFFER = 200
 
+# Player-season requests sent concurrently per chunk; the quota is checked
+# and progress saved between chunks
+HISTORICAL_BATCH_SIZE = 50
+
+# Team stats CSVs parsed this run, keyed by safe team name. A file is
+# dropped once rewritten so the combined file is built from the saved CSV.
+TEAM_STATS_CACHE: Dict[str, pd.DataFrame] = {}
+
 
 class ProgressTracker:
-    """Track scraping progress for resume capability."""
+    """
+    Track scraping progress for resume capability.
+    
+    Scraped player-seasons, finished new-team seasons and checkpoints are
+    appended to a write-ahead log next to the progress JSON. The log is
+    replayed on load and compacted into the JSON when a team is completed
+    or after PROGRESS_COMPACT_EVENTS entries.
+    """
     
     def __init__(self, progress_file: str = HISTORICAL_PROGRESS_FILE):
         self.progress_file = progress_file
+        self.wal = WriteAheadLog(f"{os.path.splitext(progress_file)[0]}.wal.jsonl")
+        self._wal_events = 0
         self.progress = self.load()
+        # Membership is checked through sets; the JSON keeps sorted lists
+        self._scraped_sets: Dict[str, Dict[str, Set[int]]] = {
+            team_name: {key: set(seasons) for key, seasons in players.items()}
+            for team_name, players in self.progress["scraped_seasons"].items()
+        }
+        self._replay_wal()
+        atexit.register(self.close)
     
     def load(self) -> dict:
         """Load progress from file."""
@@ -65,34 +95,73 @@ class ProgressTracker:
             "last_updated": datetime.now().isoformat()
         }
     
+    def _replay_wal(self):
+        """Apply log entries written after the progress JSON was last compacted."""
+        for entry in self.wal.entries():
+            if "player_id" in entry:
+                self._add_scraped_season(entry["team"], entry["player_id"], entry["season"])
+            elif "season_done" in entry:
+                self._add_season_done(entry["team"], entry["season_done"])
+            elif entry.get("last_updated", "") > (self.progress["last_updated"] or ""):
+                # Checkpoint newer than the JSON (older ones were compacted)
+                self.progress.update(entry)
+    
+    def _append_wal(self, entry: dict, flush: bool = False):
+        self.wal.append(entry, flush=flush)
+        self._wal_events += 1
+    
     def save(self):
-        """Save progress to file."""
+        """Checkpoint the counters and flush logged progress to disk."""
+        self.progress["last_updated"] = datetime.now().isoformat()
+        checkpoint = {
+            key: value for key, value in self.progress.items()
+            if key not in ("completed_teams", "scraped_seasons", "new_teams_progress")
+        }
+        self._append_wal(checkpoint, flush=True)
+        if self._wal_events >= PROGRESS_COMPACT_EVENTS:
+            self.compact()
+    
+    def close(self):
+        """Write a final checkpoint if anything was logged since the last compaction."""
+        if self.wal.is_open:
+            self.save()
+            self.wal.close()
+    
+    def compact(self):
+        """Rewrite the full progress JSON and start a new, empty log."""
         self.progress["last_updated"] = datetime.now().isoformat()
-        with open(self.progress_file, 'w') as f:
+        self.progress["scraped_seasons"] = {
+            team_name: {key: sorted(seasons) for key, seasons in players.items()}
+            for team_name, players in self._scraped_sets.items()
+        }
+        tmp_file = f"{self.progress_file}.tmp"
+        with open(tmp_file, 'w') as f:
             json.dump(self.progress, f, indent=2)
+        os.replace(tmp_file, self.progress_file)
+        self.wal.clear()
+        self._wal_events = 0
     
     def is_team_completed(self, team_name: str) -> bool:
         return team_name in self.progress["completed_teams"]
     
-    def get_player_scraped_seasons(self, team_name: str, player_id: int) -> List[int]:
+    def get_player_scraped_seasons(self, team_name: str, player_id: int) -> Set[int]:
         """Get seasons already scraped for a player in this historical run."""
         key = str(player_id)
-        return self.progress["scraped_seasons"].get(team_name, {}).get(key, [])
+        return self._scraped_sets.get(team_name, {}).get(key, set())
+    
+    def _add_scraped_season(self, team_name: str, player_id: int, season: int):
+        key = str(player_id)
+        self._scraped_sets.setdefault(team_name, {}).setdefault(key, set()).add(season)
     
     def mark_player_season(self, team_name: str, player_id: int, season: int):
         """Mark a season as scraped for a player."""
-        if team_name not in self.progress["scraped_seasons"]:
-            self.progress["scraped_seasons"][team_name] = {}
-        key = str(player_id)
-        if key not in self.progress["scraped_seasons"][team_name]:
-            self.progress["scraped_seasons"][team_name][key] = []
-        if season not in self.progress["scraped_seasons"][team_name][key]:
-            self.progress["scraped_seasons"][team_name][key].append(season)
+        self._add_scraped_season(team_name, player_id, season)
+        self._append_wal({"team": team_name, "player_id": player_id, "season": season})
     
     def mark_team_completed(self, team_name: str):
         if team_name not in self.progress["completed_teams"]:
             self.progress["completed_teams"].append(team_name)
-        self.save()
+        self.compact()
     
     def add_api_calls(self, count: int):
         self.progress["api_calls_made"] += count
@@ -119,10 +188,14 @@ class ProgressTracker:
         if team_name not in self.progress["new_teams_progress"]:
             self.progress["new_teams_progress"][team_name] = {"squad_fetched": False, "seasons_done": []}
         self.progress["new_teams_progress"][team_name]["squad_fetched"] = True
-        self.save()
+        self.compact()
     
     def add_new_team_season_done(self, team_name: str, season: int):
         """Mark a season as done for a new team."""
+        self._add_season_done(team_name, season)
+        self._append_wal({"team": team_name, "season_done": season})
+    
+    def _add_season_done(self, team_name: str, season: int):
         if "new_teams_progress" not in self.progress:
             self.progress["new_teams_progress"] = {}
         if team_name not in self.progress["new_teams_progress"]:
@@ -152,13 +225,37 @@ def check_quota() -> int:
         return 0
 
 
+def remaining_quota() -> int:
+    """
+    Remaining API quota from the headers of recent responses, falling back
+    to a status request when no key has reported yet (e.g. all responses
+    so far came from the cache).
+    """
+    remaining = api_client.get_daily_remaining()
+    if remaining is None:
+        return check_quota()
+    return remaining
+
+
+def load_team_stats(team_name: str) -> pd.DataFrame:
+    """
+    Load a team's stats CSV, parsing each file at most once per run.
+    Returns an empty DataFrame if the team has no stats file.
+    """
+    safe_name = team_name.replace(" ", "_").lower()
+    if safe_name not in TEAM_STATS_CACHE:
+        stats_file = f"{STATISTICS_OUTPUT_DIR}/{safe_name}_player_statistics.csv"
+        if os.path.exists(stats_file):
+            TEAM_STATS_CACHE[safe_name] = pd.read_csv(stats_file)
+        else:
+            TEAM_STATS_CACHE[safe_name] = pd.DataFrame()
+    return TEAM_STATS_CACHE[safe_name]
+
+
 def get_existing_seasons(team_name: str) -> List[int]:
     """Get seasons already scraped for a team."""
-    safe_name = team_name.replace(" ", "_").lower()
-    stats_file = f"{STATISTICS_OUTPUT_DIR}/{safe_name}_player_statistics.csv"
-    
-    if os.path.exists(stats_file):
-        df = pd.read_csv(stats_file)
+    df = load_team_stats(team_name)
+    if 'season' in df.columns:
         return sorted(df['season'].unique().tolist())
     return []
 
@@ -169,7 +266,7 @@ def merge_and_save_stats(team_name: str, new_stats_df: pd.DataFrame, team_id: in
     stats_file = f"{STATISTICS_OUTPUT_DIR}/{safe_name}_player_statistics.csv"
     
     if os.path.exists(stats_file):
-        existing_df = pd.read_csv(stats_file)
+        existing_df = load_team_stats(team_name)
         print(f"  Existing data: {len(existing_df)} records, seasons {sorted(existing_df['season'].unique())}")
     else:
         existing_df = pd.DataFrame()
@@ -187,11 +284,17 @@ def merge_and_save_stats(team_name: str, new_stats_df: pd.DataFrame, team_id: in
     
     # Combine and deduplicate
     if not existing_df.empty:
-        combined_df = pd.concat([existing_df, new_stats_df], ignore_index=True)
-        # Remove duplicates based on key columns
-        combined_df = combined_df.drop_duplicates(
-            subset=['player_id', 'season', 'team_id', 'league_id'],
-            keep='first'
+        # Only the key columns are hashed and only surviving rows are
+        # concatenated; on a key clash the existing row wins
+        key = ['player_id', 'season', 'team_id', 'league_id']
+        duplicated = pd.concat(
+            [existing_df[key], new_stats_df[key]], ignore_index=True
+        ).duplicated().to_numpy()
+        num_existing = len(existing_df)
+        if duplicated[:num_existing].any():
+            existing_df = existing_df[~duplicated[:num_existing]]
+        combined_df = pd.concat(
+            [existing_df, new_stats_df[~duplicated[num_existing:]]], ignore_index=True
         )
     else:
         combined_df = new_stats_df
@@ -201,6 +304,7 @@ def merge_and_save_stats(team_name: str, new_stats_df: pd.DataFrame, team_id: in
     
     # Save
     combined_df.to_csv(stats_file, index=False)
+    TEAM_STATS_CACHE.pop(safe_name, None)
     print(f"  ✅ Saved {len(combined_df)} total records to {stats_file}")
     print(f"     Seasons now: {sorted(combined_df['season'].unique())}")
     
@@ -321,131 +425,55 @@ def scrape_historical_for_team(
     if existing_seasons:
         print(f"     Already have in CSV: {existing_seasons}")
     
-    all_player_stats = []
-    # api_calls_made already initialized above
-    quota_exhausted = False
-    
-    for idx, player in squad_df.iterrows():
-        if pd.isna(player.get("player_id")):
+    # Every (player, season) still to fetch, in player then season order
+    tasks = []
+    for player_id, player_name in zip(squad_df["player_id"].tolist(), squad_df["player_name"].tolist()):
+        if pd.isna(player_id):
             continue
-            
-        player_id = int(player["player_id"])
-        player_name = player.get("player_name", f"Player {player_id}")
+        
+        player_id = int(player_id)
         
         # Check which seasons still need to be scraped for this player
         already_scraped = progress.get_player_scraped_seasons(team_name, player_id)
-        seasons_for_player = [s for s in new_seasons if s not in already_scraped]
-        
-        if not seasons_for_player:
-            continue  # All seasons for this player already done
+        for season in new_seasons:
+            if season not in already_scraped:
+                tasks.append((player_id, player_name, season))
+    
+    # Parsed rows are appended column-wise; the national_team_* columns are
+    # added by merge_and_save_stats
+    columns = {col: [] for col in STATS_COLUMNS if not col.startswith('national_team_')}
+    # api_calls_made already initialized above
+    quota_exhausted = False
+    
+    # Fetch in chunks of HISTORICAL_BATCH_SIZE concurrent requests, checking
+    # the quota and saving progress between chunks
+    for start in range(0, len(tasks), HISTORICAL_BATCH_SIZE):
+        chunk = tasks[start:start + HISTORICAL_BATCH_SIZE]
         
         # Check quota before making requests
-        if api_calls_made > 0 and api_calls_made % 50 == 0:
-            remaining = check_quota()
+        if start > 0:
+            remaining = remaining_quota()
             print(f"     [Quota check: {remaining} remaining]")
             if remaining < MIN_QUOTA_BUFFER:
                 print(f"  ⚠️ Quota too low ({remaining} < {MIN_QUOTA_BUFFER}). Stopping.")
                 quota_exhausted = True
                 break
         
-        # Scrape this player's historical stats
-        player_stats = []
+        # Results come back in task order
+        responses = scraper.api.batch(
+            [("players", {"id": player_id, "season": season}) for player_id, _, season in chunk],
+            return_exceptions=True,
+        )
+        chunk_calls = 0
         
-        for season in seasons_for_player:
+        for (player_id, player_name, season), response in zip(chunk, responses):
             try:
-                stats_response = scraper.api.get_player_statistics(player_id, season)
-                api_calls_made += 1
+                if isinstance(response, Exception):
+                    raise response
+                stats_response = response.get("response", [])
+                chunk_calls += 1
                 
-                if stats_response:
-                    player_data = stats_response[0]
-                    player_info = player_data.get("player", {})
-                    birth = player_info.get("birth", {})
-                    
-                    for stat in player_data.get("statistics", []):
-                        league = stat.get("league", {})
-                        team = stat.get("team", {})
-                        games = stat.get("games", {})
-                        substitutes = stat.get("substitutes", {})
-                        shots = stat.get("shots", {})
-                        goals_data = stat.get("goals", {})
-                        passes = stat.get("passes", {})
-                        tackles = stat.get("tackles", {})
-                        duels = stat.get("duels", {})
-                        dribbles = stat.get("dribbles", {})
-                        fouls = stat.get("fouls", {})
-                        cards = stat.get("cards", {})
-                        penalty = stat.get("penalty", {})
-                        
-                        player_stats.append({
-                            # Player info
-                            "player_id": player_info.get("id"),
-                            "player_name": player_info.get("name"),
-                            "firstname": player_info.get("firstname"),
-                            "lastname": player_info.get("lastname"),
-                            "nationality": player_info.get("nationality"),
-                            "birth_date": birth.get("date"),
-                            "birth_place": birth.get("place"),
-                            "birth_country": birth.get("country"),
-                            "age": player_info.get("age"),
-                            "height": player_info.get("height"),
-                            "weight": player_info.get("weight"),
-                            "injured": player_info.get("injured"),
-                            "photo": player_info.get("photo"),
-                            # Team & League
-                            "season": season,
-                            "team_id": team.get("id"),
-                            "team_name": team.get("name"),
-                            "league_id": league.get("id"),
-                            "league_name": league.get("name"),
-                            "league_country": league.get("country"),
-                            # Games
-                            "position": games.get("position"),
-                            "appearances": games.get("appearences"),
-                            "lineups": games.get("lineups"),
-                            "minutes": games.get("minutes"),
-                            "rating": games.get("rating"),
-                            "captain": games.get("captain"),
-                            # Substitutes
-                            "substitutes_in": substitutes.get("in"),
-                            "substitutes_out": substitutes.get("out"),
-                            "substitutes_bench": substitutes.get("bench"),
-                            # Shooting
-                            "shots_total": shots.get("total"),
-                            "shots_on_target": shots.get("on"),
-                            # Goals
-                            "goals": goals_data.get("total"),
-                            "goals_conceded": goals_data.get("conceded"),
-                            "assists": goals_data.get("assists"),
-                            "saves": goals_data.get("saves"),
-                            # Passing
-                            "passes_total": passes.get("total"),
-                            "passes_key": passes.get("key"),
-                            "passes_accuracy": passes.get("accuracy"),
-                            # Defensive
-                            "tackles_total": tackles.get("total"),
-                            "tackles_blocks": tackles.get("blocks"),
-                            "tackles_interceptions": tackles.get("interceptions"),
-                            # Duels
-                            "duels_total": duels.get("total"),
-                            "duels_won": duels.get("won"),
-                            # Dribbles
-                            "dribbles_attempts": dribbles.get("attempts"),
-                            "dribbles_success": dribbles.get("success"),
-                            "dribbles_past": dribbles.get("past"),
-                            # Fouls
-                            "fouls_drawn": fouls.get("drawn"),
-                            "fouls_committed": fouls.get("committed"),
-                            # Cards
-                            "cards_yellow": cards.get("yellow"),
-                            "cards_yellowred": cards.get("yellowred"),
-                            "cards_red": cards.get("red"),
-                            # Penalties
-                            "penalty_won": penalty.get("won"),
-                            "penalty_committed": penalty.get("commited"),
-                            "penalty_scored": penalty.get("scored"),
-                            "penalty_missed": penalty.get("missed"),
-                            "penalty_saved": penalty.get("saved"),
-                        })
+                parse_player_season(player_id, season, stats_response, columns)
                 
                 # Mark season as done for this player
                 progress.mark_player_season(team_name, player_id, season)
@@ -457,27 +485,19 @@ def scrape_historical_for_team(
             except Exception as e:
                 print(f"  ⚠️ Error fetching stats for {player_name} season {season}: {e}")
         
-        if player_stats:
-            all_player_stats.extend(player_stats)
-        
-        # Save progress periodically
-        if api_calls_made % 20 == 0:
-            progress.add_api_calls(20)
-            progress.save()
-            
-        # If quota exhausted, break out of player loop immediately
-        if quota_exhausted:
-            break
+        # Save progress after every chunk
+        api_calls_made += chunk_calls
+        progress.add_api_calls(chunk_calls)
+        progress.save()
     
     # Don't mark team as completed here - do it after merge succeeds in main()
     
-    progress.add_api_calls(api_calls_made % 20)  # Add remaining calls
     progress.save()
     
     # IMPORTANT: Return whatever data we have, even if partial
     # The caller will save it to CSV
-    if all_player_stats:
-        return pd.DataFrame(all_player_stats), api_calls_made, quota_exhausted
+    if columns["season"]:
+        return pd.DataFrame(columns), api_calls_made, quota_exhausted
     return pd.DataFrame(), api_calls_made, quota_exhausted
 
 
@@ -586,14 +606,20 @@ def main():
         if filename.endswith("_player_statistics.csv") and filename != "all_player_statistics.csv":
             filepath = f"{STATISTICS_OUTPUT_DIR}/{filename}"
             try:
-                df = pd.read_csv(filepath)
+                # Files not rewritten this run were already parsed
+                df = TEAM_STATS_CACHE.get(filename[:-len("_player_statistics.csv")])
+                if df is None:
+                    df = pd.read_csv(filepath)
                 if not df.empty:
                     all_stats.append(df)
             except Exception:
                 pass
     
     if all_stats:
-        combined_all = pd.concat(all_stats, ignore_index=True)
+        if len(all_stats) == 1:
+            combined_all = all_stats[0]
+        else:
+            combined_all = pd.concat(all_stats, ignore_index=True)
         # Deduplicate
         combined_all = combined_all.drop_duplicates(
             subset=['player_id', 'season', 'team_id', 'league_id'],
@@ -70,6 +70,65 @@ def save_progress(progress: Dict[str, Any]):
 # Parse player stats from API response
 # =============================================================================
 
+# Shared stand-in for missing stat sections (never mutated)
+_EMPTY: Dict[str, Any] = {}
+
+# Output columns taken from the 'games' section, as (column, api_key)
+GAME_FIELDS = [
+    ('minutes_played', 'minutes'),
+    ('player_number', 'number'),
+    ('position', 'position'),
+    ('rating', 'rating'),
+    ('is_captain', 'captain'),
+    ('is_substitute', 'substitute'),
+]
+
+# Stat sections read per player
+STAT_SECTIONS = (
+    'shots', 'goals', 'passes', 'tackles', 'duels',
+    'dribbles', 'fouls', 'cards', 'penalty',
+)
+
+# Output columns after 'appeared', as (column, section, api_key)
+STAT_FIELDS = [
+    # Shots
+    ('shots_total', 'shots', 'total'),
+    ('shots_on_target', 'shots', 'on'),
+    # Goals
+    ('goals_scored', 'goals', 'total'),
+    ('goals_conceded', 'goals', 'conceded'),
+    ('goals_assists', 'goals', 'assists'),
+    ('goals_saves', 'goals', 'saves'),
+    # Passes
+    ('passes_total', 'passes', 'total'),
+    ('passes_key', 'passes', 'key'),
+    ('passes_accuracy', 'passes', 'accuracy'),
+    # Tackles
+    ('tackles_total', 'tackles', 'total'),
+    ('tackles_blocks', 'tackles', 'blocks'),
+    ('tackles_interceptions', 'tackles', 'interceptions'),
+    # Duels
+    ('duels_total', 'duels', 'total'),
+    ('duels_won', 'duels', 'won'),
+    # Dribbles
+    ('dribbles_attempts', 'dribbles', 'attempts'),
+    ('dribbles_success', 'dribbles', 'success'),
+    ('dribbles_past', 'dribbles', 'past'),
+    # Fouls
+    ('fouls_drawn', 'fouls', 'drawn'),
+    ('fouls_committed', 'fouls', 'committed'),
+    # Cards
+    ('cards_yellow', 'cards', 'yellow'),
+    ('cards_red', 'cards', 'red'),
+    # Penalty
+    ('penalty_won', 'penalty', 'won'),
+    ('penalty_committed', 'penalty', 'commited'),  # API typo: "commited"
+    ('penalty_scored', 'penalty', 'scored'),
+    ('penalty_missed', 'penalty', 'missed'),
+    ('penalty_saved', 'penalty', 'saved'),
+]
+
+
 def parse_player_stats(
     fixture_id: int,
     world_cup_year: int,
@@ -87,18 +146,9 @@ def parse_player_stats(
     rows = []
     for player_entry in team_data['players']:
         player = player_entry['player']
-        stats = player_entry['statistics'][0] if player_entry.get('statistics') else {}
-        
-        games = stats.get('games', {})
-        shots = stats.get('shots', {})
-        goals = stats.get('goals', {})
-        passes = stats.get('passes', {})
-        tackles = stats.get('tackles', {})
-        duels = stats.get('duels', {})
-        dribbles = stats.get('dribbles', {})
-        fouls = stats.get('fouls', {})
-        cards = stats.get('cards', {})
-        penalty = stats.get('penalty', {})
+        stats = player_entry['statistics'][0] if player_entry.get('statistics') else _EMPTY
+        games = stats.get('games') or _EMPTY
+        sections = {section: stats.get(section) or _EMPTY for section in STAT_SECTIONS}
         
         row = {
             # Match identifiers
@@ -113,63 +163,18 @@ def parse_player_stats(
             # Player identity
             'player_id': player.get('id'),
             'player_name': player.get('name'),
-            
-            # Game info
-            'minutes_played': games.get('minutes'),
-            'player_number': games.get('number'),
-            'position': games.get('position'),
-            'rating': games.get('rating'),
-            'is_captain': games.get('captain'),
-            'is_substitute': games.get('substitute'),
-            'appeared': games.get('minutes') is not None,
-            
-            # Shots
-            'shots_total': shots.get('total'),
-            'shots_on_target': shots.get('on'),
-            
-            # Goals
-            'goals_scored': goals.get('total'),
-            'goals_conceded': goals.get('conceded'),
-            'goals_assists': goals.get('assists'),
-            'goals_saves': goals.get('saves'),
-            
-            # Passes
-            'passes_total': passes.get('total'),
-            'passes_key': passes.get('key'),
-            'passes_accuracy': passes.get('accuracy'),
-            
-            # Tackles
-            'tackles_total': tackles.get('total'),
-            'tackles_blocks': tackles.get('blocks'),
-            'tackles_interceptions': tackles.get('interceptions'),
-            
-            # Duels
-            'duels_total': duels.get('total'),
-            'duels_won': duels.get('won'),
-            
-            # Dribbles
-            'dribbles_attempts': dribbles.get('attempts'),
-            'dribbles_success': dribbles.get('success'),
-            'dribbles_past': dribbles.get('past'),
-            
-            # Fouls
-            'fouls_drawn': fouls.get('drawn'),
-            'fouls_committed': fouls.get('committed'),
-            
-            # Cards
-            'cards_yellow': cards.get('yellow'),
-            'cards_red': cards.get('red'),
-            
-            # Penalty
-            'penalty_won': penalty.get('won'),
-            'penalty_committed': penalty.get('commited'),  # API typo: "commited"
-            'penalty_scored': penalty.get('scored'),
-            'penalty_missed': penalty.get('missed'),
-            'penalty_saved': penalty.get('saved'),
-            
-            # Offsides
-            'offsides': stats.get('offsides'),
         }
+        
+        # Game info
+        for column, key in GAME_FIELDS:
+            row[column] = games.get(key)
+        row['appeared'] = row['minutes_played'] is not None
+        
+        for column, section, key in STAT_FIELDS:
+            row[column] = sections[section].get(key)
+        
+        # Offsides
+        row['offsides'] = stats.get('offsides')
         rows.append(row)
     
     return rows
@@ -189,7 +194,12 @@ POSITION_MAP = {
 
 def expand_positions(df: pd.DataFrame) -> pd.DataFrame:
     """Expand single-character position codes to full names."""
-    df['position'] = df['position'].map(POSITION_MAP).fillna(df['position'])
+    # Only a handful of distinct codes repeat across all rows, so each one
+    # is looked up once and the results mapped back through the codes
+    codes, uniques = pd.factorize(df['position'])
+    expanded = pd.array([POSITION_MAP.get(code, code) for code in uniques], dtype=object)
+    # Missing positions have code -1, which take() keeps missing
+    df['position'] = expanded.take(codes, allow_fill=True)
     return df
 
 
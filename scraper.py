@@ -3,12 +3,15 @@ Main scraper module for collecting World Cup 2026 football data.
 """
 import os
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import pandas as pd
 from tqdm import tqdm
 
 from api_client import api_client
+from utils import CombinedCSVWriter
 from config import (
     WORLD_CUP_LEAGUE_ID,
     WORLD_CUP_REFERENCE_SEASON,
@@ -21,8 +24,43 @@ from config import (
     PLAYERS_OUTPUT_DIR,
     STATISTICS_OUTPUT_DIR,
     PLAYER_STATS_FIELDS,
+    PLAYER_STATS_DTYPES,
 )
 
+# Players of a team fetched at once. Each player's seasons are already one
+# concurrent batch; overlapping the next player keeps the keys busy while
+# the slowest seasons of the previous one finish
+PLAYER_WORKERS = 2
+
+
+class ScrapeStopped(Exception):
+    """Raised when a team scrape is stopped before it finished."""
+
+
+def cast_player_stats_dtypes(df: pd.DataFrame) -> int:
+    """
+    Cast the PLAYER_STATS_DTYPES columns of a statistics frame in place.
+    
+    Numeric columns come back as ints, numeric strings or None; they are
+    stored as compact nullable dtypes rather than object/float64 columns.
+    
+    Args:
+        df: Statistics rows as parsed from the API
+        
+    Returns:
+        Number of non-numeric values that were set to missing
+        
+    Raises:
+        TypeError/ValueError: If a numeric value doesn't fit its integer
+            dtype (e.g. 2.5 or out of range)
+    """
+    coerced = 0
+    for column, dtype in PLAYER_STATS_DTYPES.items():
+        values = pd.to_numeric(df[column], errors="coerce")
+        coerced += int((values.isna() & df[column].notna()).sum())
+        df[column] = values.astype(dtype)
+    return coerced
+
 
 class WorldCup2026Scraper:
     """Scraper for World Cup 2026 data collection."""
@@ -234,17 +272,45 @@ class WorldCup2026Scraper:
         if seasons is None:
             seasons = SEASONS_TO_SCRAPE
         
-        all_stats = []
+        season_frames = []
         
-        for season in seasons:
+        # Fetch all seasons concurrently; results come back in season order
+        responses = self.api.batch(
+            [("players", {"id": player_id, "season": season}) for season in seasons],
+            return_exceptions=True,
+        )
+        
+        for season, response in zip(seasons, responses):
             try:
-                stats_response = self.api.get_player_statistics(player_id, season)
+                if isinstance(response, Exception):
+                    raise response
+                stats_response = response.get("response", [])
+                season_rows = []
                 
                 if stats_response:
                     player_data = stats_response[0]
                     player_info = player_data.get("player", {})
                     birth = player_info.get("birth", {})
                     
+                    # Player-level fields are the same for every statistics
+                    # entry, so build them once per player-season
+                    player_row = {
+                        # Player info
+                        "player_id": player_info.get("id"),
+                        "player_name": player_info.get("name"),
+                        "firstname": player_info.get("firstname"),
+                        "lastname": player_info.get("lastname"),
+                        "nationality": player_info.get("nationality"),
+                        "birth_date": birth.get("date"),
+                        "birth_place": birth.get("place"),
+                        "birth_country": birth.get("country"),
+                        "age": player_info.get("age"),
+                        "height": player_info.get("height"),
+                        "weight": player_info.get("weight"),
+                        "injured": player_info.get("injured"),
+                        "photo": player_info.get("photo"),
+                    }
+                    
                     for stat in player_data.get("statistics", []):
                         league = stat.get("league", {})
                         team = stat.get("team", {})
@@ -260,21 +326,8 @@ class WorldCup2026Scraper:
                         cards = stat.get("cards", {})
                         penalty = stat.get("penalty", {})
                         
-                        all_stats.append({
-                            # Player info
-                            "player_id": player_info.get("id"),
-                            "player_name": player_info.get("name"),
-                            "firstname": player_info.get("firstname"),
-                            "lastname": player_info.get("lastname"),
-                            "nationality": player_info.get("nationality"),
-                            "birth_date": birth.get("date"),
-                            "birth_place": birth.get("place"),
-                            "birth_country": birth.get("country"),
-                            "age": player_info.get("age"),
-                            "height": player_info.get("height"),
-                            "weight": player_info.get("weight"),
-                            "injured": player_info.get("injured"),
-                            "photo": player_info.get("photo"),
+                        season_rows.append({
+                            **player_row,
                             # Team & League
                             "season": season,
                             "team_id": team.get("id"),
@@ -330,17 +383,31 @@ class WorldCup2026Scraper:
                             "penalty_missed": penalty.get("missed"),
                             "penalty_saved": penalty.get("saved"),
                         })
+                
+                if season_rows:
+                    # Cast per season so a value that doesn't fit its dtype
+                    # only drops this season, not the whole player
+                    season_df = pd.DataFrame(season_rows)
+                    coerced = cast_player_stats_dtypes(season_df)
+                    if coerced:
+                        print(f"  ⚠️ {player_name} season {season}: {coerced} non-numeric stat values set to missing")
+                    season_frames.append(season_df)
                         
             except Exception as e:
                 print(f"  ⚠️ Error fetching stats for {player_name} season {season}: {e}")
         
-        return pd.DataFrame(all_stats)
+        if not season_frames:
+            return pd.DataFrame()
+        if len(season_frames) == 1:
+            return season_frames[0]
+        return pd.concat(season_frames, ignore_index=True)
 
     def scrape_all_team_players_statistics(
         self,
         team_id: int,
         team_name: str,
         squad_df: pd.DataFrame,
+        stop: Optional[threading.Event] = None,
     ) -> pd.DataFrame:
         """
         Scrape statistics for all players in a team's squad.
@@ -349,31 +416,44 @@ class WorldCup2026Scraper:
             team_id: Team ID
             team_name: Team name
             squad_df: DataFrame with squad player information
+            stop: If given and set, no further players are fetched
             
         Returns:
             DataFrame with all player statistics
+            
+        Raises:
+            ScrapeStopped: If `stop` was set before every player was fetched
+                (nothing is saved)
         """
         print(f"\n{'=' * 60}")
         print(f"Scraping player statistics for {team_name}")
         print(f"{'=' * 60}")
         
         all_player_stats = []
+        players = list(zip(squad_df["player_id"].tolist(), squad_df["player_name"].tolist()))
         
-        for _, player in tqdm(squad_df.iterrows(), total=len(squad_df), desc=f"Players from {team_name}"):
-            player_id = player["player_id"]
-            player_name = player["player_name"]
-            
+        def fetch_player(player: tuple) -> pd.DataFrame:
+            player_id, player_name = player
+            if stop is not None and stop.is_set():
+                raise ScrapeStopped(f"Stopped before {player_name} ({team_name})")
             try:
-                stats_df = self.scrape_player_statistics(player_id, player_name)
+                return self.scrape_player_statistics(player_id, player_name)
+            except Exception as e:
+                print(f"  Error processing {player_name}: {e}")
+                return pd.DataFrame()
+        
+        # map() yields in squad order, so the output matches a sequential run
+        with ThreadPoolExecutor(max_workers=PLAYER_WORKERS) as executor:
+            for stats_df in tqdm(executor.map(fetch_player, players), total=len(players), desc=f"Players from {team_name}"):
                 if not stats_df.empty:
                     stats_df["national_team_id"] = team_id
                     stats_df["national_team_name"] = team_name
                     all_player_stats.append(stats_df)
-            except Exception as e:
-                print(f"  Error processing {player_name}: {e}")
         
         if all_player_stats:
             combined_df = pd.concat(all_player_stats, ignore_index=True)
+            # The per-player pieces aren't needed once combined
+            all_player_stats.clear()
             
             # Save to CSV
             safe_name = team_name.replace(" ", "_").lower()
@@ -501,9 +581,13 @@ class WorldCup2026Scraper:
             teams_df = teams_df.head(max_teams)
             print(f"\nLimiting to {max_teams} teams for testing")
         
-        # Step 2: For each team, scrape squad and player statistics
-        all_squads = []
-        all_player_statistics = []
+        # Step 2: For each team, scrape squad and player statistics.
+        # Each team is appended to the combined files as soon as it is
+        # scraped instead of keeping every team in memory for one concat;
+        # like the concat, the files end up with the union of the teams'
+        # columns.
+        squads_writer = CombinedCSVWriter(f"{PLAYERS_OUTPUT_DIR}/all_squads.csv")
+        stats_writer = CombinedCSVWriter(f"{STATISTICS_OUTPUT_DIR}/all_player_statistics.csv")
         team_ids = []
         
         for _, team in teams_df.iterrows():
@@ -519,26 +603,22 @@ class WorldCup2026Scraper:
             # Get squad
             squad_df = self.scrape_team_squad(team_id, team_name)
             if not squad_df.empty:
-                all_squads.append(squad_df)
+                squads_writer.append(squad_df)
                 
                 # Get player statistics
                 player_stats_df = self.scrape_all_team_players_statistics(
                     team_id, team_name, squad_df
                 )
                 if not player_stats_df.empty:
-                    all_player_statistics.append(player_stats_df)
+                    stats_writer.append(player_stats_df)
         
         # Save combined squad data
-        if all_squads:
-            combined_squads = pd.concat(all_squads, ignore_index=True)
-            combined_squads.to_csv(f"{PLAYERS_OUTPUT_DIR}/all_squads.csv", index=False)
-            print(f"\nSaved combined squads: {len(combined_squads)} players")
+        if squads_writer.finish():
+            print(f"\nSaved combined squads: {squads_writer.rows} players")
         
         # Save combined player statistics
-        if all_player_statistics:
-            combined_stats = pd.concat(all_player_statistics, ignore_index=True)
-            combined_stats.to_csv(f"{STATISTICS_OUTPUT_DIR}/all_player_statistics.csv", index=False)
-            print(f"Saved combined statistics: {len(combined_stats)} records")
+        if stats_writer.finish():
+            print(f"Saved combined statistics: {stats_writer.rows} records")
         
         # Step 3: Scrape international competition fixtures
         print("\n" + "=" * 60)
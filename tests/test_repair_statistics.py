@@ -0,0 +1,102 @@
+"""
+Tests for repair_statistics.py.
+Run with: python -m unittest discover tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+import repair_statistics
+from api_client import RateLimitExhausted
+
+
+def make_stats_rows(national_team_id: int, national_team_name: str, player_id: int) -> pd.DataFrame:
+    """Two seasons of stats rows for one player, with every STATS_COLUMNS column."""
+    df = pd.DataFrame([
+        {col: None for col in repair_statistics.STATS_COLUMNS}
+        for _ in range(2)
+    ])
+    df['player_id'] = player_id
+    df['player_name'] = f"Player {player_id}"
+    df['nationality'] = national_team_name
+    df['season'] = [2023, 2024]
+    df['team_id'] = 10
+    df['team_name'] = "Club"
+    df['league_id'] = 39
+    df['league_name'] = "Premier League"
+    df['league_country'] = "England"
+    df['position'] = "Midfielder"
+    df['national_team_id'] = national_team_id
+    df['national_team_name'] = national_team_name
+    return df
+
+
+class RebuildAllPlayerStatisticsTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.stats_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.stats_dir)
+        # Stats paths are cached per team key and would keep another test's dir
+        self.addCleanup(repair_statistics.get_stats_file_for_team.cache_clear)
+    
+    def rebuild(self, team_frames: dict) -> pd.DataFrame:
+        for team_key, df in team_frames.items():
+            df.to_csv(f"{self.stats_dir}/{team_key}_player_statistics.csv", index=False)
+        registry = {
+            team_key: (int(df['national_team_id'].iloc[0]), df['national_team_name'].iloc[0])
+            for team_key, df in team_frames.items()
+        }
+        with mock.patch.object(repair_statistics, 'STATISTICS_OUTPUT_DIR', self.stats_dir), \
+                mock.patch.object(repair_statistics, 'TEAM_REGISTRY', registry):
+            repair_statistics.rebuild_all_player_statistics()
+        return pd.read_csv(f"{self.stats_dir}/all_player_statistics.csv")
+    
+    def test_category_column_empty_in_one_file(self):
+        ghana = make_stats_rows(1504, "Ghana", 1)
+        japan = make_stats_rows(12, "Japan", 2)
+        japan['league_country'] = None
+        
+        combined = self.rebuild({"ghana": ghana, "japan": japan})
+        
+        self.assertEqual(len(combined), 4)
+        self.assertEqual(combined['national_team_name'].tolist(), ["Ghana"] * 2 + ["Japan"] * 2)
+        self.assertEqual(combined['league_country'].iloc[:2].tolist(), ["England"] * 2)
+        self.assertTrue(combined['league_country'].iloc[2:].isna().all())
+        # Newest season first within each player
+        self.assertEqual(combined['season'].tolist(), [2024, 2023, 2024, 2023])
+
+
+class RepairTeamTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.stats_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.stats_dir)
+        # Stats paths are cached per team key and would keep another test's dir
+        self.addCleanup(repair_statistics.get_stats_file_for_team.cache_clear)
+    
+    def test_rate_limited_player_season_not_marked_scraped(self):
+        squad = pd.DataFrame({'player_id': [1], 'player_name': ["Player 1"]})
+        progress = mock.Mock()
+        progress.get_player_scraped_seasons.return_value = set()
+        client = mock.Mock()
+        # Results come back in task order: 2024 first (recent first), then 2023
+        client.batch.return_value = [
+            {"response": []},
+            RateLimitExhausted("Still rate limited after 5 retries: players"),
+        ]
+        
+        with mock.patch.object(repair_statistics, 'STATISTICS_OUTPUT_DIR', self.stats_dir), \
+                mock.patch.object(repair_statistics, 'api_client', client), \
+                mock.patch.object(repair_statistics, 'analyze_team_gaps',
+                                  return_value=(squad, 0, {1: {2023, 2024}})):
+            repair_statistics.repair_team("ghana", 1504, "Ghana", progress)
+        
+        progress.mark_player_season_scraped.assert_called_once_with(1, 2024)
+
+
+if __name__ == "__main__":
+    unittest.main()
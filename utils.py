@@ -2,11 +2,149 @@
 Utility functions for data processing and analysis.
 """
 import os
+import csv
+import json
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 
 
+class WriteAheadLog:
+    """
+    Append-only JSON-lines log kept next to a progress JSON, so progress
+    can be recorded without rewriting the whole JSON each time.
+    
+    A line torn by a crash (or by the buffered writer flushing mid-record)
+    is skipped on replay, and the first append after reopening starts on a
+    fresh line so later entries aren't glued onto the torn one.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.file = None
+    
+    @property
+    def is_open(self) -> bool:
+        """True once something was appended since the log was last closed."""
+        return self.file is not None
+    
+    def entries(self) -> Iterator[dict]:
+        """Yield the logged entries in order, skipping unreadable lines."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn line from an interrupted write
+                if isinstance(entry, dict):
+                    yield entry
+    
+    def append(self, entry: dict, flush: bool = True):
+        """
+        Append one entry.
+        
+        Args:
+            entry: JSON-serializable dict
+            flush: Flush to the OS right away (otherwise on the next flush)
+        """
+        if self.file is None:
+            torn = False
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                with open(self.path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n"
+            self.file = open(self.path, 'a')
+            if torn:
+                self.file.write("\n")
+        self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        if flush:
+            self.file.flush()
+    
+    def flush(self):
+        if self.file is not None:
+            self.file.flush()
+    
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+    
+    def clear(self):
+        """Close and delete the log (after its entries were compacted)."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class CombinedCSVWriter:
+    """
+    Appends per-team DataFrames to a combined CSV as teams finish, so only
+    one team's data is held in memory. Rows go to a .partial file that
+    replaces the real output only when the run finishes, so an interrupted
+    run leaves the previous combined file untouched.
+    
+    Unless disabled, a Parquet copy is written next to the CSV when the run
+    finishes; it is the same file the readers' CSV caches would build, so
+    downstream loads skip parsing the CSV.
+    """
+    
+    def __init__(self, output_path: str, write_parquet: bool = True):
+        self.output_path = output_path
+        self.partial_path = f"{output_path}.partial"
+        self.parquet_path = f"{os.path.splitext(output_path)[0]}.parquet"
+        self.write_parquet = write_parquet
+        self.file = None
+        self.columns: Optional[List[str]] = None
+        self.rows = 0
+    
+    def append(self, df: pd.DataFrame):
+        """
+        Write a team's rows, aligned to the columns written so far. Columns
+        missing from the team are left empty; columns new to the file are
+        added at the end (as pd.concat would), widening the rows already
+        written.
+        """
+        if self.file is None:
+            self.file = open(self.partial_path, "w", newline="")
+            self.columns = list(df.columns)
+            df.to_csv(self.file, index=False)
+        else:
+            new_columns = [col for col in df.columns if col not in self.columns]
+            if new_columns:
+                self._widen(new_columns)
+            df.reindex(columns=self.columns).to_csv(self.file, header=False, index=False)
+        self.rows += len(df)
+    
+    def _widen(self, new_columns: List[str]):
+        """Rewrite the rows written so far with empty values for new columns."""
+        print(f"   Adding columns to {os.path.basename(self.output_path)}: {', '.join(map(str, new_columns))}")
+        self.file.close()
+        tmp_path = f"{self.partial_path}.tmp"
+        with open(self.partial_path, "r", newline="") as src, open(tmp_path, "w", newline="") as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst, lineterminator="\n")
+            writer.writerow(next(reader) + new_columns)
+            padding = [""] * len(new_columns)
+            for row in reader:
+                writer.writerow(row + padding)
+        os.replace(tmp_path, self.partial_path)
+        self.columns.extend(new_columns)
+        self.file = open(self.partial_path, "a", newline="")
+    
+    def finish(self) -> bool:
+        """Move the written rows into place. Returns False if nothing was written."""
+        if self.file is None:
+            return False
+        self.file.close()
+        self.file = None
+        os.replace(self.partial_path, self.output_path)
+        if self.write_parquet:
+            pd.read_csv(self.output_path).to_parquet(self.parquet_path, index=False, compression="zstd")
+        return True
+
+
 def load_all_player_statistics(data_dir: str = "data/statistics") -> pd.DataFrame:
     """
     Load all player statistics from CSV files.